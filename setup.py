@@ -34,8 +34,12 @@ setup(
     extras_require={
         "dev": [
             "pytest>=8.0.0",
+            "hypothesis>=6.100.0",
             "black>=24.0.0",
             "flake8>=7.0.0",
         ],
+        "faiss": [
+            "faiss-cpu>=1.7.4",
+        ],
     },
 )
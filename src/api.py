@@ -1,11 +1,13 @@
 """
 FastAPI web interface for DocuMind.
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import AsyncIterator, List, Optional
+import os
 import uvicorn
+from src.file_handler import FileHandler, get_file_handler
 
 
 app = FastAPI(
@@ -23,22 +25,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Bytes read from the request body per write when storing uploads
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 class QueryRequest(BaseModel):
     """Request model for queries."""
+    model_config = ConfigDict(extra='ignore')
+
     query: str
     top_k: Optional[int] = 5
 
 
+class Source(BaseModel):
+    """Source document attribution for an answer."""
+    model_config = ConfigDict(extra='ignore')
+
+    doc_id: str
+    score: float
+    snippet: str
+
+
 class QueryResponse(BaseModel):
     """Response model for queries."""
+    model_config = ConfigDict(extra='ignore')
+
     query: str
     answer: str
-    sources: List[Dict[str, Any]]
+    sources: List[Source]
 
 
 class DocumentUpload(BaseModel):
     """Model for document metadata."""
+    model_config = ConfigDict(extra='ignore')
+
     doc_id: str
     filename: str
     status: str
@@ -68,13 +88,23 @@ async def health_check():
     }
 
 
+async def _iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield an uploaded file's content in fixed-size chunks."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 @app.post("/upload", response_model=DocumentUpload)
-async def upload_document(file: UploadFile = File(...)):
+async def upload_document(
+    file: UploadFile = File(...),
+    file_handler: FileHandler = Depends(get_file_handler)
+):
     """
     Upload a document for processing.
 
     Args:
         file: Document file to upload
+        file_handler: Shared file handler
 
     Returns:
         Upload confirmation with doc_id
@@ -93,12 +123,15 @@ async def upload_document(file: UploadFile = File(...)):
             detail=f"File type {file.content_type} not supported"
         )
 
-    # In production, would process and store the file
-    # For now, return mock response
-    doc_id = f"doc_{hash(file.filename)}"
+    # Stream the body to disk instead of buffering it in memory
+    stored = await file_handler.save_upload_stream(
+        _iter_upload(file),
+        file.filename,
+        file.content_type
+    )
 
     return DocumentUpload(
-        doc_id=doc_id,
+        doc_id=stored['file_id'],
         filename=file.filename,
         status="uploaded"
     )
@@ -121,27 +154,33 @@ async def query_documents(request: QueryRequest):
         query=request.query,
         answer="This is a placeholder answer. In production, this would use the RAG pipeline to generate context-aware responses.",
         sources=[
-            {
-                "doc_id": "doc_1",
-                "score": 0.95,
-                "snippet": "Relevant context from document..."
-            }
+            Source(
+                doc_id="doc_1",
+                score=0.95,
+                snippet="Relevant context from document..."
+            )
         ]
     )
 
 
+# Plain def: FastAPI runs these in its threadpool, keeping the blocking
+# directory scans and unlinks off the event loop
 @app.get("/documents")
-async def list_documents():
+def list_documents(file_handler: FileHandler = Depends(get_file_handler)):
     """List all uploaded documents."""
+    documents = file_handler.list_files()
     return {
-        "documents": [],
-        "count": 0
+        "documents": documents,
+        "count": len(documents)
     }
 
 
 @app.delete("/documents/{doc_id}")
-async def delete_document(doc_id: str):
-    """Delete a document from the knowledge base."""
+def delete_document(doc_id: str, file_handler: FileHandler = Depends(get_file_handler)):
+    """Delete an uploaded document."""
+    if not file_handler.delete_file(doc_id):
+        raise HTTPException(status_code=404, detail=f"Document {doc_id} not found")
+
     return {
         "doc_id": doc_id,
         "status": "deleted"
@@ -149,4 +188,12 @@ async def delete_document(doc_id: str):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers require the app as an import string
+    uvicorn.run(
+        "src.api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count()
+    )
@@ -1,35 +1,95 @@
 """
 Caching layer for embeddings and query results.
 """
-from typing import Any, Optional, Dict
-import hashlib
-import json
+from typing import Any, Optional, Dict, Tuple
+from collections import OrderedDict
 import time
 from pathlib import Path
 import pickle
+import sqlite3
+import struct
+import threading
+import msgpack
+import xxhash
+
+
+CACHE_CATEGORIES = ["embeddings", "queries", "responses", "vision"]
+
+# Characters encoded per hasher update when keying long strings
+_HASH_SLICE_CHARS = 1 << 16
+
+# Type tags hashed before scalar values; other types use b'o'
+_SCALAR_TAGS = {bool: b't', int: b'i', float: b'f', type(None): b'n'}
+
+# Categories holding plain str/dict values, stored as msgpack
+_MSGPACK_CATEGORIES = {"queries", "responses", "vision"}
+
+# One-byte tags identifying how a stored value was serialized
+_FORMAT_PICKLE = b'P'
+_FORMAT_MSGPACK = b'M'
 
 
 class CacheManager:
     """
     Manage caching for embeddings and query results to improve performance.
+
+    Entries live in a single memory-mapped SQLite database keyed by
+    (category, key), so lookups, TTL checks and eviction are index
+    operations rather than per-file filesystem calls. The serialized
+    bytes of recently used entries are also kept in a bounded in-process
+    LRU, so hot keys are served without a database query. Every get
+    decodes a fresh value, so callers never share state with the cache
+    and values have the same types whether they come from memory or disk.
     """
 
-    def __init__(self, cache_dir: str = ".cache", ttl: int = 3600):
+    def __init__(
+        self,
+        cache_dir: str = ".cache",
+        ttl: int = 3600,
+        mmap_size: int = 256 * 1024 * 1024,
+        memory_size: int = 10_000
+    ):
         """
         Initialize the cache manager.
 
         Args:
             cache_dir: Directory for cache storage
             ttl: Time-to-live for cache entries in seconds (default 1 hour)
+            mmap_size: Bytes of the database file to memory-map (default 256 MB)
+            memory_size: Maximum entries held in the in-process LRU (0 disables it)
         """
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
         self.ttl = ttl
+        self.db_path = self.cache_dir / "cache.db"
+        self.memory_size = memory_size
 
-        # Create subdirectories
-        (self.cache_dir / "embeddings").mkdir(exist_ok=True)
-        (self.cache_dir / "queries").mkdir(exist_ok=True)
-        (self.cache_dir / "responses").mkdir(exist_ok=True)
+        # (category, key) -> (serialized value, timestamp), most recently used last
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[bytes, float]]" = OrderedDict()
+
+        self.cache_dir.mkdir(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                category TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                timestamp REAL NOT NULL,
+                PRIMARY KEY (category, key)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_timestamp ON cache (timestamp)"
+        )
 
     def _generate_key(self, data: Any) -> str:
         """
@@ -41,41 +101,161 @@ class CacheManager:
         Returns:
             Hash string
         """
-        if isinstance(data, (dict, list)):
-            data_str = json.dumps(data, sort_keys=True)
+        hasher = xxhash.xxh3_128()
+        self._update_hasher(hasher, data)
+        return hasher.hexdigest()
+
+    def _update_hasher(self, hasher: "xxhash.xxh3_128", data: Any) -> None:
+        """
+        Feed data into an incremental hasher without serializing it first.
+
+        Dicts are walked in sorted key order and lists in sequence, so
+        no JSON string of the whole structure is ever built. Long strings
+        are encoded a slice at a time, which bounds the transient
+        allocation regardless of input size.
+
+        Args:
+            hasher: Incremental xxh3 hasher
+            data: Data to hash
+        """
+        if isinstance(data, dict):
+            hasher.update(b'{')
+            for k in sorted(data):
+                self._update_hasher(hasher, k)
+                hasher.update(b':')
+                self._update_hasher(hasher, data[k])
+            hasher.update(b'}')
+        elif isinstance(data, (list, tuple)):
+            hasher.update(b'[')
+            for item in data:
+                self._update_hasher(hasher, item)
+            hasher.update(b']')
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            hasher.update(b'b')
+            hasher.update(data)
         else:
-            data_str = str(data)
+            # Tag the type so 1, 1.0, True, None and their strings differ
+            if isinstance(data, str):
+                text, tag = data, b's'
+            else:
+                text, tag = str(data), _SCALAR_TAGS.get(type(data), b'o')
+            hasher.update(tag)
+            for i in range(0, len(text), _HASH_SLICE_CHARS):
+                hasher.update(text[i:i + _HASH_SLICE_CHARS].encode())
+            hasher.update(b'\x00')
+
+    def _is_expired(self, timestamp: float) -> bool:
+        """
+        Check if a cache entry is expired.
 
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        Args:
+            timestamp: Time the entry was written
 
-    def _get_cache_path(self, key: str, category: str) -> Path:
+        Returns:
+            True if expired, False otherwise
         """
-        Get the file path for a cache entry.
+        return time.time() - timestamp > self.ttl
+
+    def _serialize(self, value: Any, category: str = "general") -> bytes:
+        """
+        Serialize a cache value.
+
+        Plain values in the msgpack categories (query results, responses)
+        are packed with msgpack, which is faster and more compact than
+        pickle for strings and dicts. Everything else, including numpy
+        embeddings, is pickled with the highest protocol; large contiguous
+        buffers are emitted out of band and appended after the pickle
+        stream, so they are written without an intermediate copy.
 
         Args:
-            key: Cache key
+            value: Value to serialize
             category: Cache category
 
         Returns:
-            Path to cache file
+            Serialized bytes, prefixed with a one-byte format tag
         """
-        return self.cache_dir / category / f"{key}.pkl"
-
-    def _is_expired(self, file_path: Path) -> bool:
+        if category in _MSGPACK_CATEGORIES:
+            try:
+                return _FORMAT_MSGPACK + msgpack.packb(value, use_bin_type=True)
+            except (TypeError, ValueError, OverflowError):
+                # Not msgpack-representable; fall back to pickle
+                pass
+
+        buffers = []
+        payload = pickle.dumps(
+            value,
+            protocol=pickle.HIGHEST_PROTOCOL,
+            buffer_callback=buffers.append
+        )
+        raws = [buf.raw() for buf in buffers]
+
+        header = struct.pack(
+            f"<IQ{len(raws)}Q",
+            len(raws),
+            len(payload),
+            *(raw.nbytes for raw in raws)
+        )
+        return b"".join([_FORMAT_PICKLE, header, payload, *raws])
+
+    def _deserialize(self, data: bytes) -> Any:
         """
-        Check if a cache entry is expired.
+        Deserialize a cache value produced by _serialize.
+
+        Pickled out-of-band buffers are handed back to pickle as views over
+        a single mutable copy of the data, so numpy arrays are rebuilt
+        without further copies and stay writable.
 
         Args:
-            file_path: Path to cache file
+            data: Serialized bytes
 
         Returns:
-            True if expired, False otherwise
+            Cached value
+        """
+        tag = data[:1]
+        if tag == _FORMAT_MSGPACK:
+            return msgpack.unpackb(
+                memoryview(data)[1:],
+                raw=False,
+                strict_map_key=False
+            )
+        if tag != _FORMAT_PICKLE:
+            raise ValueError(f"Unknown cache entry format: {tag!r}")
+
+        view = memoryview(bytearray(data))[1:]
+        num_buffers, payload_len = struct.unpack_from("<IQ", view)
+        offset = struct.calcsize("<IQ")
+        buffer_lens = struct.unpack_from(f"<{num_buffers}Q", view, offset)
+        offset += 8 * num_buffers
+
+        payload = view[offset:offset + payload_len]
+        offset += payload_len
+
+        buffers = []
+        for length in buffer_lens:
+            buffers.append(view[offset:offset + length])
+            offset += length
+
+        return pickle.loads(payload, buffers=buffers)
+
+    def _remember(self, category: str, key: str, data: bytes, timestamp: float) -> None:
+        """
+        Store an entry in the in-process LRU, evicting the oldest if full.
+
+        Must be called with the lock held.
+
+        Args:
+            category: Cache category
+            key: Cache key
+            data: Serialized value
+            timestamp: Time the entry was written
         """
-        if not file_path.exists():
-            return True
+        if self.memory_size <= 0:
+            return
 
-        file_age = time.time() - file_path.stat().st_mtime
-        return file_age > self.ttl
+        self._memory[(category, key)] = (data, timestamp)
+        self._memory.move_to_end((category, key))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
 
     def set(self, key: str, value: Any, category: str = "general") -> None:
         """
@@ -86,13 +266,16 @@ class CacheManager:
             value: Value to cache
             category: Cache category
         """
-        cache_path = self._get_cache_path(key, category)
+        data = self._serialize(value, category)
+        timestamp = time.time()
 
-        with open(cache_path, 'wb') as f:
-            pickle.dump({
-                'value': value,
-                'timestamp': time.time()
-            }, f)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (category, key, value, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                (category, key, data, timestamp)
+            )
+            self._remember(category, key, data, timestamp)
 
     def get(self, key: str, category: str = "general") -> Optional[Any]:
         """
@@ -105,18 +288,32 @@ class CacheManager:
         Returns:
             Cached value or None if not found/expired
         """
-        cache_path = self._get_cache_path(key, category)
-
-        if self._is_expired(cache_path):
+        with self._lock:
+            row = self._memory.get((category, key))
+            remembered = row is not None and not self._is_expired(row[1])
+            if remembered:
+                self._memory.move_to_end((category, key))
+            else:
+                self._memory.pop((category, key), None)
+                row = self._conn.execute(
+                    "SELECT value, timestamp FROM cache WHERE category = ? AND key = ?",
+                    (category, key)
+                ).fetchone()
+
+        if row is None or self._is_expired(row[1]):
             return None
 
         try:
-            with open(cache_path, 'rb') as f:
-                data = pickle.load(f)
-                return data['value']
-        except (FileNotFoundError, pickle.UnpicklingError):
+            value = self._deserialize(row[0])
+        except (pickle.UnpicklingError, struct.error, ValueError):
             return None
 
+        if not remembered:
+            with self._lock:
+                self._remember(category, key, row[0], row[1])
+
+        return value
+
     def cache_embedding(self, text: str, embedding: Any) -> None:
         """
         Cache an embedding for text.
@@ -165,7 +362,13 @@ class CacheManager:
         key = self._generate_key(query)
         return self.get(key, category="queries")
 
-    def cache_response(self, query: str, context: str, response: str) -> None:
+    def cache_response(
+        self,
+        query: str,
+        context: str,
+        response: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Cache a generated response.
 
@@ -173,24 +376,113 @@ class CacheManager:
             query: User query
             context: Context used
             response: Generated response
+            params: Optional generation parameters (model, prompt, temperature)
+                that also determine the response
         """
-        key = self._generate_key({"query": query, "context": context})
+        key = self._response_key(query, context, params)
         self.set(key, response, category="responses")
 
-    def get_cached_response(self, query: str, context: str) -> Optional[str]:
+    def get_cached_response(
+        self,
+        query: str,
+        context: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """
         Get cached response.
 
         Args:
             query: User query
             context: Context used
+            params: Generation parameters the response was cached with
 
         Returns:
             Cached response or None
         """
-        key = self._generate_key({"query": query, "context": context})
+        key = self._response_key(query, context, params)
         return self.get(key, category="responses")
 
+    def _response_key(
+        self,
+        query: str,
+        context: str,
+        params: Optional[Dict[str, Any]]
+    ) -> str:
+        """
+        Generate the cache key for a response.
+
+        Args:
+            query: User query
+            context: Context used
+            params: Optional generation parameters
+
+        Returns:
+            Hash string
+        """
+        data = {"query": query, "context": context}
+        if params:
+            data["params"] = params
+        return self._generate_key(data)
+
+    def _vision_key(self, image: str, prompt: str, model: str, max_tokens: Optional[int]) -> str:
+        """
+        Generate the cache key for a vision analysis.
+
+        Args:
+            image: Base64 image payload or data URL
+            prompt: Prompt sent with the image
+            model: Vision model name
+            max_tokens: Optional output token limit of the request
+
+        Returns:
+            Hash string
+        """
+        data = {"image": image, "prompt": prompt, "model": model}
+        if max_tokens is not None:
+            data["max_tokens"] = max_tokens
+        return self._generate_key(data)
+
+    def cache_vision_result(
+        self,
+        image: str,
+        prompt: str,
+        model: str,
+        result: str,
+        max_tokens: Optional[int] = None
+    ) -> None:
+        """
+        Cache a vision model analysis of an image.
+
+        Args:
+            image: Base64 image payload or data URL
+            prompt: Prompt sent with the image
+            model: Vision model name
+            result: Model output
+            max_tokens: Optional output token limit the result was generated with
+        """
+        self.set(self._vision_key(image, prompt, model, max_tokens), result, category="vision")
+
+    def get_cached_vision_result(
+        self,
+        image: str,
+        prompt: str,
+        model: str,
+        max_tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Get a cached vision model analysis.
+
+        Args:
+            image: Base64 image payload or data URL
+            prompt: Prompt sent with the image
+            model: Vision model name
+            max_tokens: Optional output token limit of the request
+
+        Returns:
+            Cached result or None
+        """
+        return self.get(self._vision_key(image, prompt, model, max_tokens), category="vision")
+
     def clear_category(self, category: str) -> int:
         """
         Clear all entries in a category.
@@ -201,14 +493,14 @@ class CacheManager:
         Returns:
             Number of entries deleted
         """
-        category_dir = self.cache_dir / category
-        count = 0
-
-        for cache_file in category_dir.glob("*.pkl"):
-            cache_file.unlink()
-            count += 1
-
-        return count
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE category = ?",
+                (category,)
+            )
+            for entry in [k for k in self._memory if k[0] == category]:
+                del self._memory[entry]
+        return cursor.rowcount
 
     def clear_expired(self) -> int:
         """
@@ -217,16 +509,16 @@ class CacheManager:
         Returns:
             Number of entries deleted
         """
-        count = 0
+        cutoff = time.time() - self.ttl
 
-        for category in ["embeddings", "queries", "responses"]:
-            category_dir = self.cache_dir / category
-            for cache_file in category_dir.glob("*.pkl"):
-                if self._is_expired(cache_file):
-                    cache_file.unlink()
-                    count += 1
-
-        return count
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE timestamp < ?",
+                (cutoff,)
+            )
+            for entry in [k for k, (_, ts) in self._memory.items() if ts < cutoff]:
+                del self._memory[entry]
+        return cursor.rowcount
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -235,15 +527,24 @@ class CacheManager:
         Returns:
             Dictionary with cache stats
         """
-        stats = {}
+        stats = {
+            category: {'total': 0, 'expired': 0}
+            for category in CACHE_CATEGORIES
+        }
 
-        for category in ["embeddings", "queries", "responses"]:
-            category_dir = self.cache_dir / category
-            files = list(category_dir.glob("*.pkl"))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*), SUM(timestamp < ?) FROM cache GROUP BY category",
+                (time.time() - self.ttl,)
+            ).fetchall()
 
-            stats[category] = {
-                'total': len(files),
-                'expired': sum(1 for f in files if self._is_expired(f))
-            }
+        for category, total, expired in rows:
+            stats[category] = {'total': total, 'expired': expired or 0}
 
         return stats
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.close()
@@ -3,6 +3,14 @@ Document chunking strategies for optimal embedding and retrieval.
 """
 from typing import List, Dict, Any
 import re
+import numpy as np
+
+
+# Paragraph breaks: blank lines, possibly containing whitespace
+_PARA_RE = re.compile(r'\n\s*\n')
+
+# Sentence breaks: whitespace following terminal punctuation
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
 
 
 class DocumentChunker:
@@ -34,30 +42,50 @@ class DocumentChunker:
         if not text or len(text) == 0:
             return []
 
+        breaks = self._find_breaks(text)
+        text_len = len(text)
+
         chunks = []
         start = 0
 
-        while start < len(text):
+        while start < text_len:
             end = start + self.chunk_size
 
-            # If not at the end, try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings
-                period_idx = text.rfind('.', start, end)
-                newline_idx = text.rfind('\n', start, end)
-                break_idx = max(period_idx, newline_idx)
-
-                if break_idx > start:
-                    end = break_idx + 1
+            # If not at the end, try to break at the last sentence boundary
+            # before the window end
+            if end < text_len:
+                idx = int(np.searchsorted(breaks, end, side='left')) - 1
+                if idx >= 0 and breaks[idx] > start:
+                    end = int(breaks[idx]) + 1
 
             chunk = text[start:end].strip()
             if chunk:
                 chunks.append(chunk)
 
-            start = end - self.chunk_overlap
+            # Always move forward, even when a boundary close to the window
+            # start leaves the chunk shorter than the overlap
+            start = max(end - self.chunk_overlap, start + 1)
 
         return chunks
 
+    def _find_breaks(self, text: str) -> np.ndarray:
+        """
+        Locate every sentence boundary ('.' or newline) in one vectorized scan.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Sorted array of character offsets of boundary characters
+        """
+        if text.isascii():
+            codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        else:
+            # UTF-32 keeps one element per character so offsets match str indices
+            codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+        return np.flatnonzero((codes == 0x2E) | (codes == 0x0A))
+
     def chunk_by_paragraphs(self, text: str) -> List[str]:
         """
         Chunk text by paragraphs.
@@ -69,7 +97,7 @@ class DocumentChunker:
             List of paragraph chunks
         """
         # Split by double newlines or similar paragraph markers
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARA_RE.split(text)
 
         chunks = []
         current_chunk = ""
@@ -102,7 +130,7 @@ class DocumentChunker:
             List of sentence-based chunks
         """
         # Simple sentence splitting
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENT_RE.split(text)
 
         chunks = []
         current_chunk = ""
@@ -147,14 +175,15 @@ class DocumentChunker:
         else:
             chunks = self.chunk_by_tokens(text)
 
-        result = []
-        for i, chunk in enumerate(chunks):
-            chunk_data = {
+        chunk_count = len(chunks)
+        chunk_metadata = metadata or {}
+
+        return [
+            {
                 'text': chunk,
                 'chunk_id': i,
-                'chunk_count': len(chunks),
-                'metadata': metadata or {}
+                'chunk_count': chunk_count,
+                'metadata': chunk_metadata
             }
-            result.append(chunk_data)
-
-        return result
+            for i, chunk in enumerate(chunks)
+        ]
@@ -4,8 +4,8 @@ Multi-modal embedding generation for text and images.
 from typing import List, Union
 import os
 import numpy as np
-from openai import OpenAI
 from dotenv import load_dotenv
+from src.openai_client import get_client
 
 load_dotenv()
 
@@ -25,7 +25,7 @@ class EmbeddingGenerator:
         """
         self.model_name = model_name or os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
         self.dimension = 1536  # Default dimension for text-embedding-3-small
 
     def embed_text(self, text: str) -> np.ndarray:
@@ -39,7 +39,7 @@ class EmbeddingGenerator:
             Embedding vector as numpy array
         """
         if not text or len(text.strip()) == 0:
-            return np.zeros(self.dimension)
+            return np.zeros(self.dimension, dtype=np.float32)
 
         response = self.client.embeddings.create(
             input=text,
@@ -47,14 +47,15 @@ class EmbeddingGenerator:
         )
 
         embedding = response.data[0].embedding
-        return np.array(embedding)
+        return np.array(embedding, dtype=np.float32)
 
-    def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+    def embed_texts(self, texts: List[str], batch_size: int = 2048) -> List[np.ndarray]:
         """
         Generate embeddings for multiple texts in batch.
 
         Args:
             texts: List of input texts
+            batch_size: Maximum texts per API request (the API caps this at 2048)
 
         Returns:
             List of embedding vectors
@@ -65,12 +66,14 @@ class EmbeddingGenerator:
         # Filter out empty texts
         filtered_texts = [t if t and t.strip() else " " for t in texts]
 
-        response = self.client.embeddings.create(
-            input=filtered_texts,
-            model=self.model_name
-        )
+        embeddings = []
+        for start in range(0, len(filtered_texts), batch_size):
+            response = self.client.embeddings.create(
+                input=filtered_texts[start:start + batch_size],
+                model=self.model_name
+            )
+            embeddings.extend(np.array(data.embedding, dtype=np.float32) for data in response.data)
 
-        embeddings = [np.array(data.embedding) for data in response.data]
         return embeddings
 
     def embed_query(self, query: str) -> np.ndarray:
@@ -85,6 +88,23 @@ class EmbeddingGenerator:
         """
         return self.embed_text(query)
 
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several search queries in one request.
+
+        Args:
+            queries: Search query texts
+
+        Returns:
+            Matrix with one query embedding per row; blank queries get
+            zero rows, as in embed_text
+        """
+        embeddings = np.zeros((len(queries), self.dimension), dtype=np.float32)
+        nonblank = [i for i, query in enumerate(queries) if query and query.strip()]
+        if nonblank:
+            embeddings[nonblank] = self.embed_texts([queries[i] for i in nonblank])
+        return embeddings
+
     def combine_embeddings(
         self,
         text_embedding: np.ndarray,
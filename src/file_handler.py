@@ -1,11 +1,19 @@
 """
 File upload and storage handling for DocuMind.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional
 from pathlib import Path
+import aiofiles
+import glob
+import os
 import shutil
-import hashlib
+import time
+import xxhash
 from datetime import datetime
+from functools import lru_cache
+
+
+FILE_CATEGORIES = ["pdfs", "images", "temp"]
 
 
 class FileHandler:
@@ -21,12 +29,20 @@ class FileHandler:
             upload_dir: Directory for storing uploaded files
         """
         self.upload_dir = Path(upload_dir)
+
         self.upload_dir.mkdir(exist_ok=True)
 
         # Create subdirectories for different file types
-        (self.upload_dir / "pdfs").mkdir(exist_ok=True)
-        (self.upload_dir / "images").mkdir(exist_ok=True)
-        (self.upload_dir / "temp").mkdir(exist_ok=True)
+        for cat in FILE_CATEGORIES:
+            (self.upload_dir / cat).mkdir(exist_ok=True)
+
+        # file_id -> stored path, so lookups don't scan the upload directories
+        self._file_index: Dict[str, Path] = {}
+        for cat in FILE_CATEGORIES:
+            with os.scandir(self.upload_dir / cat) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self._file_index[Path(entry.name).stem] = Path(entry.path)
 
     def generate_file_id(self, filename: str) -> str:
         """
@@ -38,9 +54,14 @@ class FileHandler:
         Returns:
             Unique file identifier
         """
-        timestamp = datetime.now().isoformat()
-        content = f"{filename}_{timestamp}"
-        file_id = hashlib.md5(content.encode()).hexdigest()
+        # Monotonic nanoseconds plus random bytes keep IDs unique even for
+        # the same filename uploaded concurrently
+        content = (
+            filename.encode()
+            + time.perf_counter_ns().to_bytes(8, 'big')
+            + os.urandom(8)
+        )
+        file_id = xxhash.xxh3_128_hexdigest(content)
         return file_id
 
     def get_file_category(self, content_type: str) -> str:
@@ -90,6 +111,8 @@ class FileHandler:
         with open(file_path, 'wb') as f:
             f.write(file_content)
 
+        self._file_index[file_id] = file_path
+
         return {
             'file_id': file_id,
             'original_filename': filename,
@@ -101,6 +124,65 @@ class FileHandler:
             'upload_time': datetime.now().isoformat()
         }
 
+    async def save_upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: str
+    ) -> Dict[str, Any]:
+        """
+        Save an uploaded file from a stream of byte chunks.
+
+        Chunks are written to disk as they arrive, so memory use stays
+        constant regardless of file size and the event loop is never
+        blocked on file I/O. Size and content hash are computed in the
+        same pass.
+
+        Args:
+            chunks: Async iterator yielding file content
+            filename: Original filename
+            content_type: MIME type
+
+        Returns:
+            Dictionary with file metadata
+        """
+        file_id = self.generate_file_id(filename)
+        category = self.get_file_category(content_type)
+
+        # Preserve file extension
+        file_ext = Path(filename).suffix
+        stored_filename = f"{file_id}{file_ext}"
+
+        file_path = self.upload_dir / category / stored_filename
+
+        size_bytes = 0
+        hasher = xxhash.xxh3_128()
+
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    size_bytes += len(chunk)
+                    hasher.update(chunk)
+        except BaseException:
+            # Don't leave a partial file behind, including on cancellation
+            file_path.unlink(missing_ok=True)
+            raise
+
+        self._file_index[file_id] = file_path
+
+        return {
+            'file_id': file_id,
+            'original_filename': filename,
+            'stored_filename': stored_filename,
+            'file_path': str(file_path),
+            'content_type': content_type,
+            'category': category,
+            'size_bytes': size_bytes,
+            'content_hash': hasher.hexdigest(),
+            'upload_time': datetime.now().isoformat()
+        }
+
     def get_file_path(self, file_id: str, category: str = None) -> Optional[Path]:
         """
         Get the path to a stored file.
@@ -112,16 +194,24 @@ class FileHandler:
         Returns:
             Path to file or None if not found
         """
-        if category:
-            categories = [category]
-        else:
-            categories = ["pdfs", "images", "temp"]
+        file_path = self._file_index.get(file_id)
+        if file_path is not None and file_path.exists():
+            if category is None or file_path.parent.name == category:
+                return file_path
+            return None
+
+        # Fall back to a direct lookup for files stored by another handler
+        categories = [category] if category else FILE_CATEGORIES
+        pattern = f"{glob.escape(file_id)}.*"
 
         for cat in categories:
             cat_dir = self.upload_dir / cat
-            for file_path in cat_dir.iterdir():
-                if file_path.stem == file_id:
-                    return file_path
+            file_path = cat_dir / file_id
+            if not file_path.is_file():
+                file_path = next(cat_dir.glob(pattern), None)
+            if file_path is not None and file_path.is_file():
+                self._file_index[file_id] = file_path
+                return file_path
 
         return None
 
@@ -138,6 +228,7 @@ class FileHandler:
         file_path = self.get_file_path(file_id)
         if file_path and file_path.exists():
             file_path.unlink()
+            self._file_index.pop(file_id, None)
             return True
         return False
 
@@ -153,24 +244,24 @@ class FileHandler:
         """
         files = []
 
-        if category:
-            categories = [category]
-        else:
-            categories = ["pdfs", "images", "temp"]
+        categories = [category] if category else FILE_CATEGORIES
 
         for cat in categories:
-            cat_dir = self.upload_dir / cat
-            for file_path in cat_dir.iterdir():
-                if file_path.is_file():
-                    files.append({
-                        'file_id': file_path.stem,
-                        'filename': file_path.name,
-                        'category': cat,
-                        'size_bytes': file_path.stat().st_size,
-                        'modified_time': datetime.fromtimestamp(
-                            file_path.stat().st_mtime
-                        ).isoformat()
-                    })
+            with os.scandir(self.upload_dir / cat) as entries:
+                for entry in entries:
+                    # is_file() is answered from the directory listing, and
+                    # the single stat() result is cached on the entry
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files.append({
+                            'file_id': Path(entry.name).stem,
+                            'filename': entry.name,
+                            'category': cat,
+                            'size_bytes': stat.st_size,
+                            'modified_time': datetime.fromtimestamp(
+                                stat.st_mtime
+                            ).isoformat()
+                        })
 
         return files
 
@@ -188,11 +279,26 @@ class FileHandler:
         deleted_count = 0
         current_time = datetime.now().timestamp()
 
-        for file_path in temp_dir.iterdir():
-            if file_path.is_file():
-                file_age_hours = (current_time - file_path.stat().st_mtime) / 3600
-                if file_age_hours > older_than_hours:
-                    file_path.unlink()
-                    deleted_count += 1
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_age_hours = (current_time - entry.stat().st_mtime) / 3600
+                    if file_age_hours > older_than_hours:
+                        os.unlink(entry.path)
+                        deleted_count += 1
 
         return deleted_count
+
+
+@lru_cache(maxsize=1)
+def get_file_handler() -> FileHandler:
+    """
+    Get the shared default file handler instance.
+
+    Suitable as a FastAPI dependency: every request reuses the same
+    handler and its file index.
+
+    Returns:
+        FileHandler instance
+    """
+    return FileHandler()
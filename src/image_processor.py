@@ -1,9 +1,10 @@
 """
 Image processing module for handling various image formats.
 """
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
-import base64
+import pybase64
 from io import BytesIO
 from pathlib import Path
 
@@ -25,12 +26,23 @@ class ImageProcessor:
         Returns:
             PIL Image object
         """
+        self._check_format(file_path)
+        return Image.open(file_path)
+
+    def _check_format(self, file_path: str) -> None:
+        """
+        Validate that a file has a supported image extension.
+
+        Args:
+            file_path: Path to the image file
+
+        Raises:
+            ValueError: If the extension is not supported
+        """
         path = Path(file_path)
         if path.suffix.lower() not in self.supported_formats:
             raise ValueError(f"Unsupported image format: {path.suffix}")
 
-        return Image.open(file_path)
-
     def resize_image(self, image: Image.Image, max_size: Tuple[int, int] = None) -> Image.Image:
         """
         Resize image while maintaining aspect ratio.
@@ -45,22 +57,34 @@ class ImageProcessor:
         if max_size is None:
             max_size = self.max_size
 
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        # reducing_gap lets Pillow shrink large images cheaply (JPEG DCT
+        # scaling / box reduce) before the final LANCZOS pass
+        image.thumbnail(max_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
         return image
 
-    def image_to_base64(self, image: Image.Image) -> str:
+    def image_to_base64(self, image: Image.Image, image_format: str = "PNG", quality: int = 85) -> str:
         """
         Convert PIL Image to base64 encoded string.
 
         Args:
             image: PIL Image object
+            image_format: Encoding format, "PNG" (lossless) or "JPEG" (much smaller)
+            quality: JPEG quality, ignored for PNG
 
         Returns:
             Base64 encoded string
         """
         buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        if image_format.upper() in ("JPEG", "JPG"):
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(buffered, format="JPEG", quality=quality)
+        else:
+            image.save(buffered, format=image_format)
+
+        # Encode straight from the buffer's memory instead of copying it out
+        with buffered.getbuffer() as view:
+            img_str = pybase64.b64encode_as_string(view)
         return img_str
 
     def get_image_info(self, image: Image.Image) -> Dict[str, Any]:
@@ -78,9 +102,32 @@ class ImageProcessor:
             'height': image.height,
             'format': image.format,
             'mode': image.mode,
-            'size_bytes': len(image.tobytes())
+            'size_bytes': self._raster_size_bytes(image)
         }
 
+    def _raster_size_bytes(self, image: Image.Image) -> int:
+        """
+        Compute the size of the decoded raster without materializing it.
+
+        Args:
+            image: PIL Image object
+
+        Returns:
+            Size in bytes that image.tobytes() would produce
+        """
+        if image.mode == '1':
+            # Bilevel images pack eight pixels per byte, row by row
+            return ((image.width + 7) // 8) * image.height
+
+        if image.mode in ('I', 'F'):
+            bytes_per_pixel = 4
+        elif image.mode.startswith('I;16'):
+            bytes_per_pixel = 2
+        else:
+            bytes_per_pixel = len(image.getbands())
+
+        return image.width * image.height * bytes_per_pixel
+
     def process_image(self, file_path: str, resize: bool = True) -> Dict[str, Any]:
         """
         Process an image file for vision model input.
@@ -92,8 +139,55 @@ class ImageProcessor:
         Returns:
             Dictionary containing processed image data
         """
-        image = self.load_image(file_path)
+        return self._process_loaded(self.load_image(file_path), file_path, resize)
+
+    def process_images(self, file_paths: List[str], resize: bool = True) -> List[Dict[str, Any]]:
+        """
+        Process a batch of image files for vision model input.
+
+        The next file is read from disk on a background thread while the
+        current one is decoded, resized and encoded, so disk latency is
+        hidden behind the CPU work.
+
+        Args:
+            file_paths: Paths to the image files
+            resize: Whether to resize the images
+
+        Returns:
+            List of processed image data dictionaries, in input order
+        """
+        for file_path in file_paths:
+            self._check_format(file_path)
+
+        results = []
+        if not file_paths:
+            return results
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(Path(file_paths[0]).read_bytes)
+
+            for i, file_path in enumerate(file_paths):
+                data = pending.result()
+                if i + 1 < len(file_paths):
+                    pending = executor.submit(Path(file_paths[i + 1]).read_bytes)
+
+                image = Image.open(BytesIO(data))
+                results.append(self._process_loaded(image, file_path, resize))
 
+        return results
+
+    def _process_loaded(self, image: Image.Image, file_path: str, resize: bool) -> Dict[str, Any]:
+        """
+        Resize and encode an already opened image.
+
+        Args:
+            image: PIL Image object
+            file_path: Path the image was loaded from
+            resize: Whether to resize the image
+
+        Returns:
+            Dictionary containing processed image data
+        """
         if resize:
             image = self.resize_image(image)
 
@@ -1,19 +1,140 @@
 """
 Logging and error handling utilities for DocuMind.
 """
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 import traceback
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched.
+
+    The stock handler formats each record before enqueueing it; here
+    formatting is left to the listener thread so the calling thread
+    only pays for the enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record unchanged."""
+        return record
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders asctime at most once per second.
+
+    With a second-resolution datefmt every record within the same second
+    shares one timestamp string, so localtime and strftime run once per
+    second instead of once per record.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted time) of the last record
+        self._cached_time: Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Return the cached timestamp when the record falls in the same second."""
+        if not datefmt:
+            # The default format includes milliseconds, so it cannot be shared
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, text = self._cached_time
+        if second != cached_second:
+            text = super().formatTime(record, datefmt)
+            self._cached_time = (second, text)
+        return text
+
+
+class BufferedFileHandler(logging.StreamHandler):
+    """
+    File handler that batches writes through a large buffer.
+
+    logging.FileHandler flushes after every record, costing a write
+    syscall per line. Here records accumulate in the file buffer and are
+    written out when it fills, when a record at or above flush_level
+    arrives, or by a background flush every flush_interval seconds.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 0.2,
+        flush_level: int = logging.ERROR,
+        encoding: str = "utf-8"
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            filename: Log file to append to
+            buffer_size: Size of the write buffer in bytes
+            flush_interval: Seconds between background flushes
+            flush_level: Records at or above this level are flushed immediately
+            encoding: Text encoding of the log file
+        """
+        super().__init__(open(filename, 'a', buffering=buffer_size, encoding=encoding))
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name=f"{type(self).__name__}-flush",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record to the buffer, flushing only for severe records."""
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _flush_periodically(self) -> None:
+        """Flush the buffer every flush_interval seconds until closed."""
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flush, then flush and close the file."""
+        self._stop_flushing.set()
+        self.acquire()
+        try:
+            stream = self.stream
+            if stream is not None:
+                self.stream = None
+                stream.flush()
+                stream.close()
+        finally:
+            self.release()
+            super().close()
+
+
 class Logger:
     """
     Custom logger for DocuMind with structured logging.
+
+    Log calls only enqueue records; a background QueueListener formats
+    them and writes to the file and console handlers.
     """
 
+    # Logger name -> running listener, so re-creating a Logger replaces it
+    _listeners: Dict[str, QueueListener] = {}
+
     def __init__(
         self,
         name: str = "DocuMind",
@@ -38,27 +159,36 @@ class Logger:
 
         # Remove existing handlers
         self.logger.handlers.clear()
+        _stop_listener(name)
+
+        # Setup handlers behind a queue drained on a background thread
+        log_queue = queue.SimpleQueue()
+        self.listener = QueueListener(
+            log_queue,
+            self._setup_file_handler(),
+            self._setup_console_handler(),
+            respect_handler_level=True
+        )
+        self.logger.addHandler(_DeferredQueueHandler(log_queue))
+        self.listener.start()
+        Logger._listeners[name] = self.listener
 
-        # Setup handlers
-        self._setup_file_handler()
-        self._setup_console_handler()
-
-    def _setup_file_handler(self):
+    def _setup_file_handler(self) -> logging.Handler:
         """Setup file handler for logging to files."""
         log_file = self.log_dir / f"{self.name}_{datetime.now().strftime('%Y%m%d')}.log"
 
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
 
-        formatter = logging.Formatter(
+        formatter = _CachedTimeFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(formatter)
 
-        self.logger.addHandler(file_handler)
+        return file_handler
 
-    def _setup_console_handler(self):
+    def _setup_console_handler(self) -> logging.Handler:
         """Setup console handler for logging to stdout."""
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
@@ -68,31 +198,47 @@ class Logger:
         )
         console_handler.setFormatter(formatter)
 
-        self.logger.addHandler(console_handler)
+        return console_handler
 
-    def info(self, message: str, **kwargs):
-        """Log info message."""
-        self.logger.info(message, extra=kwargs)
+    def close(self) -> None:
+        """Flush pending records and stop the background listener."""
+        if Logger._listeners.get(self.name) is self.listener:
+            _stop_listener(self.name)
 
-    def debug(self, message: str, **kwargs):
-        """Log debug message."""
-        self.logger.debug(message, extra=kwargs)
+    def info(self, message: str, *args, **kwargs):
+        """Log info message; args are %-formatted only if it is emitted."""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, extra=kwargs)
 
-    def warning(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
+        """Log debug message; args are %-formatted only if it is emitted."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, extra=kwargs)
+
+    def debug_lazy(self, build_message: Callable[[], str], **kwargs):
+        """Log a debug message built by a callable, only if DEBUG is enabled."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(build_message(), extra=kwargs)
+
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message."""
-        self.logger.warning(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, extra=kwargs)
 
-    def error(self, message: str, exc_info: bool = False, **kwargs):
+    def error(self, message: str, *args, exc_info: bool = False, **kwargs):
         """Log error message."""
-        self.logger.error(message, exc_info=exc_info, extra=kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, exc_info=exc_info, extra=kwargs)
 
-    def critical(self, message: str, exc_info: bool = False, **kwargs):
+    def critical(self, message: str, *args, exc_info: bool = False, **kwargs):
         """Log critical message."""
-        self.logger.critical(message, exc_info=exc_info, extra=kwargs)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, exc_info=exc_info, extra=kwargs)
 
-    def exception(self, message: str, **kwargs):
+    def exception(self, message: str, *args, **kwargs):
         """Log exception with traceback."""
-        self.logger.exception(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.exception(message, *args, extra=kwargs)
 
 
 class ErrorHandler:
@@ -113,15 +259,20 @@ class ErrorHandler:
         self,
         error: Exception,
         context: str = "",
-        reraise: bool = False
+        reraise: bool = False,
+        include_traceback: bool = False
     ) -> dict:
         """
         Handle an error with logging.
 
+        The traceback is always written to the log; it is only formatted
+        into the returned details when include_traceback is set.
+
         Args:
             error: Exception that occurred
             context: Context where error occurred
             reraise: Whether to re-raise the exception
+            include_traceback: Whether to add the formatted traceback to the details
 
         Returns:
             Error details dictionary
@@ -130,13 +281,19 @@ class ErrorHandler:
             'error_type': type(error).__name__,
             'error_message': str(error),
             'context': context,
-            'traceback': traceback.format_exc()
+            'traceback': None
         }
+        if include_traceback:
+            error_details['traceback'] = ''.join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            )
 
         # Log the error
         self.logger.error(
-            f"Error in {context}: {error_details['error_message']}",
-            exc_info=True
+            "Error in %s: %s",
+            context,
+            error_details['error_message'],
+            exc_info=error
         )
 
         if reraise:
@@ -162,8 +319,12 @@ class ErrorHandler:
             True if valid, False otherwise
         """
         if not isinstance(value, value_type):
-            error_msg = f"Invalid {name}: expected {value_type.__name__}, got {type(value).__name__}"
-            self.logger.error(error_msg)
+            self.logger.error(
+                "Invalid %s: expected %s, got %s",
+                name,
+                value_type.__name__,
+                type(value).__name__
+            )
             return False
         return True
 
@@ -181,16 +342,39 @@ class ErrorHandler:
             status: Operation status (success, failed, etc.)
             details: Additional details
         """
-        message = f"Operation '{operation}' {status}"
+        message = "Operation '%s' %s"
+        args = [operation, status]
         if details:
-            message += f" - {details}"
+            message += " - %s"
+            args.append(details)
 
         if status == "success":
-            self.logger.info(message)
+            self.logger.info(message, *args)
         elif status == "failed":
-            self.logger.error(message)
+            self.logger.error(message, *args)
         else:
-            self.logger.warning(message)
+            self.logger.warning(message, *args)
+
+
+def _stop_listener(name: str) -> None:
+    """
+    Stop a logger's background listener and close its handlers.
+
+    Args:
+        name: Logger name
+    """
+    listener = Logger._listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+@atexit.register
+def _stop_all_listeners() -> None:
+    """Drain every listener's queue before the interpreter exits."""
+    for name in list(Logger._listeners):
+        _stop_listener(name)
 
 
 # Global logger instance
@@ -2,6 +2,7 @@
 Main application entry point with optimized pipeline.
 """
 from typing import Optional, Dict, Any
+from functools import lru_cache
 from src.document_processor import PDFProcessor
 from src.image_processor import ImageProcessor
 from src.vision_model import VisionModel
@@ -14,6 +15,52 @@ from src.cache import CacheManager
 from src.logger import Logger, ErrorHandler
 
 
+@lru_cache(maxsize=None)
+def _get_embedder(model_name: Optional[str] = None) -> EmbeddingGenerator:
+    """
+    Get the shared embedding generator for a model.
+
+    Args:
+        model_name: Embedding model name (None for the configured default)
+
+    Returns:
+        EmbeddingGenerator instance
+    """
+    return EmbeddingGenerator(model_name)
+
+
+@lru_cache(maxsize=None)
+def _get_cache(ttl: int) -> CacheManager:
+    """
+    Get the shared cache manager for a time-to-live.
+
+    Args:
+        ttl: Cache time-to-live in seconds
+
+    Returns:
+        CacheManager instance
+    """
+    return CacheManager(ttl=ttl)
+
+
+@lru_cache(maxsize=None)
+def _get_vision_model(
+    model_name: Optional[str] = None,
+    cache: Optional[CacheManager] = None
+) -> VisionModel:
+    """
+    Get the shared vision model wrapper for a model and cache.
+
+    Args:
+        model_name: Vision model name (None for the configured default)
+        cache: Cache for vision results (None disables caching)
+
+    Returns:
+        VisionModel instance
+    """
+    return VisionModel(model_name, cache=cache)
+
+
 class DocuMind:
     """
     Main DocuMind application class with optimized multi-modal RAG pipeline.
@@ -42,25 +89,27 @@ class DocuMind:
         # Initialize components
         self.pdf_processor = PDFProcessor()
         self.image_processor = ImageProcessor()
-        self.vision_model = VisionModel()
         self.chunker = DocumentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
         # Initialize embedding and vector store
-        self.embedding_generator = EmbeddingGenerator()
+        self.embedding_generator = _get_embedder()
         dimension = self.embedding_generator.get_embedding_dimension()
         self.vector_store = VectorStore(dimension=dimension)
 
-        # Initialize query and response components
-        self.query_processor = QueryProcessor(self.embedding_generator, self.vector_store)
-        self.response_generator = ResponseGenerator()
-
         # Initialize cache
         self.use_cache = use_cache
         if use_cache:
-            self.cache = CacheManager(ttl=cache_ttl)
+            self.cache = _get_cache(cache_ttl)
         else:
             self.cache = None
 
+        # Vision results are cached alongside the rest when caching is on
+        self.vision_model = _get_vision_model(cache=self.cache)
+
+        # Initialize query and response components
+        self.query_processor = QueryProcessor(self.embedding_generator, self.vector_store)
+        self.response_generator = ResponseGenerator(cache=self.cache)
+
         self.logger.info("DocuMind initialized successfully")
 
     def process_pdf(self, file_path: str) -> Dict[str, Any]:
@@ -74,7 +123,7 @@ class DocuMind:
             Processing result
         """
         try:
-            self.logger.info(f"Processing PDF: {file_path}")
+            self.logger.info("Processing PDF: %s", file_path)
 
             # Extract text and metadata
             doc_data = self.pdf_processor.process_document(file_path)
@@ -86,29 +135,34 @@ class DocuMind:
                 metadata=doc_data['metadata']
             )
 
-            # Generate embeddings and store
-            for chunk in chunks:
-                # Check cache first
-                if self.use_cache:
-                    cached_embedding = self.cache.get_cached_embedding(chunk['text'])
-                    if cached_embedding is not None:
-                        embedding = cached_embedding
-                    else:
-                        embedding = self.embedding_generator.embed_text(chunk['text'])
-                        self.cache.cache_embedding(chunk['text'], embedding)
-                else:
-                    embedding = self.embedding_generator.embed_text(chunk['text'])
+            # Look up cached embeddings, then embed all misses in one batch
+            texts = [chunk['text'] for chunk in chunks]
+            embeddings = [None] * len(chunks)
+            missing = []
 
-                # Add to vector store
-                doc_id = f"{file_path}_{chunk['chunk_id']}"
-                self.vector_store.add_document(
-                    doc_id=doc_id,
-                    content=chunk['text'],
-                    embedding=embedding,
-                    metadata=chunk['metadata']
-                )
+            for i, text in enumerate(texts):
+                cached_embedding = self.cache.get_cached_embedding(text) if self.use_cache else None
+                if cached_embedding is not None:
+                    embeddings[i] = cached_embedding
+                else:
+                    missing.append(i)
+
+            if missing:
+                new_embeddings = self.embedding_generator.embed_texts([texts[i] for i in missing])
+                for i, embedding in zip(missing, new_embeddings):
+                    embeddings[i] = embedding
+                    if self.use_cache:
+                        self.cache.cache_embedding(texts[i], embedding)
+
+            # Add to vector store
+            self.vector_store.add_documents(
+                doc_ids=[f"{file_path}_{chunk['chunk_id']}" for chunk in chunks],
+                contents=texts,
+                embeddings=embeddings,
+                metadatas=[chunk['metadata'] for chunk in chunks]
+            )
 
-            self.logger.info(f"Successfully processed {len(chunks)} chunks from PDF")
+            self.logger.info("Successfully processed %d chunks from PDF", len(chunks))
 
             return {
                 'status': 'success',
@@ -131,7 +185,7 @@ class DocuMind:
             Answer with sources
         """
         try:
-            self.logger.info(f"Processing query: {question}")
+            self.logger.info("Processing query: %s", question)
 
             # Check cache for query
             if self.use_cache:
@@ -0,0 +1,43 @@
+"""
+Shared OpenAI clients for the DocuMind components.
+"""
+from typing import Dict, Optional, Tuple
+import os
+import threading
+from openai import OpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Environment default, read once at import
+_DEFAULT_BASE_URL = os.getenv('OPENAI_BASE_URL')
+
+# (api_key, base_url) -> shared client
+_CLIENT_CACHE: Dict[Tuple[Optional[str], Optional[str]], OpenAI] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client(api_key: Optional[str], base_url: Optional[str] = None) -> OpenAI:
+    """
+    Get the shared OpenAI client for an API key and endpoint.
+
+    Each client owns an HTTP connection pool, so sharing one per key lets
+    embedding, vision and chat requests reuse open connections instead
+    of paying a new TCP and TLS handshake per component instance.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional API base URL (default: OPENAI_BASE_URL)
+
+    Returns:
+        OpenAI client, created on first use
+    """
+    key = (api_key, base_url or _DEFAULT_BASE_URL)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        with _CLIENT_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                client = OpenAI(api_key=key[0], base_url=key[1])
+                _CLIENT_CACHE[key] = client
+    return client
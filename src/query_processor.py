@@ -2,9 +2,13 @@
 Query processing and retrieval for RAG pipeline.
 """
 from typing import List, Dict, Any, Tuple
+import numpy as np
 from src.embeddings import EmbeddingGenerator
 from src.vector_store import VectorStore, VectorDocument
 
+# Characters of content kept in each result's source snippet
+SNIPPET_LENGTH = 100
+
 
 class QueryProcessor:
     """
@@ -41,7 +45,8 @@ class QueryProcessor:
             threshold: Minimum similarity threshold
 
         Returns:
-            List of relevant documents with scores
+            List of relevant documents with scores and a short content
+            snippet
         """
         # Generate query embedding
         query_embedding = self.embedding_generator.embed_query(query)
@@ -53,17 +58,75 @@ class QueryProcessor:
             threshold=threshold
         )
 
-        # Format results
-        formatted_results = []
-        for doc, score in results:
-            formatted_results.append({
+        return self._format_results(results)
+
+    def process_queries(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve documents for several query variants at once.
+
+        The variants (e.g. from expand_query) are embedded in one request
+        and searched in one batched product. A document hit by several
+        variants is kept once, with its best score.
+
+        Args:
+            queries: Query variants
+            top_k: Number of results to return
+            threshold: Minimum similarity threshold
+
+        Returns:
+            List of relevant documents with scores, best first
+        """
+        if not queries:
+            return []
+
+        query_embeddings = self.embedding_generator.embed_queries(queries)
+        batches = self.vector_store.batch_search(
+            query_embeddings,
+            top_k=top_k,
+            threshold=threshold
+        )
+
+        # Keep each document's best score across variants
+        best: Dict[str, Tuple[VectorDocument, float]] = {}
+        for results in batches:
+            for doc, score in results:
+                if doc.id not in best or score > best[doc.id][1]:
+                    best[doc.id] = (doc, score)
+
+        merged = sorted(best.values(), key=lambda hit: hit[1], reverse=True)[:top_k]
+        return self._format_results(merged)
+
+    def _format_results(
+        self,
+        results: List[Tuple[VectorDocument, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn search hits into result dictionaries.
+
+        Args:
+            results: (document, NumPy scalar score) tuples from the vector store
+
+        Returns:
+            List of result dictionaries
+        """
+        return [
+            {
                 'content': doc.content,
-                'score': float(score),
+                'score': score.item(),
                 'metadata': doc.metadata,
-                'doc_id': doc.id
-            })
-
-        return formatted_results
+                'doc_id': doc.id,
+                'snippet': (
+                    doc.content[:SNIPPET_LENGTH] + '...'
+                    if len(doc.content) > SNIPPET_LENGTH else doc.content
+                )
+            }
+            for doc, score in results
+        ]
 
     def expand_query(self, query: str) -> List[str]:
         """
@@ -100,11 +163,15 @@ class QueryProcessor:
             Re-ranked results
         """
         # Simple keyword-based re-ranking
-        query_terms = set(query.lower().split())
+        query_terms = frozenset(query.lower().split())
 
         for result in results:
-            content_terms = set(result['content'].lower().split())
-            keyword_overlap = len(query_terms.intersection(content_terms))
+            if not query_terms:
+                result['rerank_score'] = result['score']
+                continue
+
+            content_terms = frozenset(result['content'].lower().split())
+            keyword_overlap = sum(term in content_terms for term in query_terms)
 
             # Adjust score based on keyword overlap
             result['rerank_score'] = result['score'] + (keyword_overlap * 0.01)
@@ -133,17 +200,10 @@ class QueryProcessor:
         """
         results = self.process_query(query, top_k=top_k)
 
-        # Combine contexts up to max length
-        context_parts = []
-        total_length = 0
-
-        for result in results:
-            content = result['content']
-            if total_length + len(content) <= max_context_length:
-                context_parts.append(content)
-                total_length += len(content)
-            else:
-                break
+        # Combine the longest prefix of contexts that fits in max length
+        lengths = np.fromiter((len(r['content']) for r in results), dtype=np.int64, count=len(results))
+        cut = int(np.searchsorted(np.cumsum(lengths), max_context_length, side='right'))
+        context_parts = [r['content'] for r in results[:cut]]
 
         return {
             'query': query,
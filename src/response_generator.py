@@ -1,30 +1,45 @@
 """
 Response generation using LLM with retrieved context.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
+from src.cache import CacheManager
+from src.openai_client import get_client
 
 load_dotenv()
 
+# Environment defaults, read once at import
+_DEFAULT_MODEL_NAME = os.getenv('MODEL_NAME', 'gpt-4')
+_DEFAULT_API_KEY = os.getenv('OPENAI_API_KEY')
+
 
 class ResponseGenerator:
     """
     Generate answers to user queries using retrieved context.
+
+    OpenAI clients are shared per API key and endpoint across instances
+    so their connection pools are reused.
     """
 
-    def __init__(self, model_name: str = None, api_key: str = None):
+    def __init__(
+        self,
+        model_name: str = None,
+        api_key: str = None,
+        cache: Optional[CacheManager] = None
+    ):
         """
         Initialize the response generator.
 
         Args:
             model_name: Name of the LLM model
             api_key: OpenAI API key
+            cache: Optional cache for generated answers
         """
-        self.model_name = model_name or os.getenv('MODEL_NAME', 'gpt-4')
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key)
+        self.model_name = model_name or _DEFAULT_MODEL_NAME
+        self.api_key = api_key or _DEFAULT_API_KEY
+        self.cache = cache
+        self.client = get_client(self.api_key)
 
     def generate_answer(
         self,
@@ -57,17 +72,35 @@ Question: {query}
 
 Please answer the question based on the context provided above."""
 
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
+        temperature = 0.7
+        max_tokens = 500
+
+        # Everything besides query and context that shapes the answer
+        params = {
+            'model': self.model_name,
+            'system_prompt': system_prompt,
+            'temperature': temperature,
+            'max_tokens': max_tokens
+        }
 
-        answer = response.choices[0].message.content
+        answer = None
+        if self.cache is not None:
+            answer = self.cache.get_cached_response(query, context, params)
+
+        if answer is None:
+            response = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
+            answer = response.choices[0].message.content
+            if self.cache is not None and answer is not None:
+                self.cache.cache_response(query, context, answer, params)
 
         return {
             'query': query,
@@ -116,7 +149,7 @@ Summary:"""
         Args:
             query: User's question
             context: Retrieved context
-            sources: List of source documents
+            sources: List of source documents, as returned by QueryProcessor
 
         Returns:
             Dictionary with answer and sources
@@ -128,7 +161,7 @@ Summary:"""
             {
                 'doc_id': src.get('doc_id'),
                 'score': src.get('score'),
-                'snippet': src.get('content', '')[:100] + '...'
+                'snippet': src['snippet'] if 'snippet' in src else src.get('content', '')[:100] + '...'
             }
             for src in sources[:3]  # Top 3 sources
         ]
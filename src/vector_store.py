@@ -1,35 +1,224 @@
 """
 Vector store for embedding-based document retrieval.
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
+from functools import lru_cache
+from pathlib import Path
+import os
+import pickle
 import numpy as np
 from dataclasses import dataclass
 
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+# "exact" scores with NumPy; the others need faiss installed
+INDEX_TYPES = ("exact", "flat", "hnsw", "ivfpq")
+
 
 @dataclass
 class VectorDocument:
-    """Document with associated vector embedding."""
+    """
+    Document with associated vector embedding.
+
+    Built on demand from the store's parallel arrays; the embedding is a
+    copy of the stored L2-normalized row.
+    """
     id: str
     content: str
     embedding: np.ndarray
     metadata: Dict[str, Any]
 
 
+def _top_k_rows(
+    scores: np.ndarray,
+    top_k: int,
+    threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the best k scores of every row at once.
+
+    Rows are partitioned and sorted with axis-wise NumPy calls, so the
+    cost does not include a Python loop per query.
+
+    Args:
+        scores: Similarities, shape (b, n)
+        top_k: Number of columns to keep per row
+        threshold: Minimum similarity threshold
+
+    Returns:
+        Tuple of (indices, scores), each of shape (b, k) and ordered by
+        descending score. Entries under the threshold are -inf.
+    """
+    k = min(top_k, scores.shape[1])
+    masked = np.where(scores >= threshold, scores, -np.inf)
+    if k < scores.shape[1]:
+        top = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(k), masked.shape)
+    top_scores = np.take_along_axis(masked, top, axis=1)
+
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+@lru_cache(maxsize=1)
+def _gpu_resources() -> "faiss.StandardGpuResources":
+    """
+    Get the process-wide FAISS GPU resources (scratch memory, streams).
+
+    Returns:
+        StandardGpuResources instance
+    """
+    return faiss.StandardGpuResources()
+
+
+def _gpu_available() -> bool:
+    """
+    Check whether FAISS was built with GPU support and sees a device.
+
+    Returns:
+        True if indexes can be moved to a GPU
+    """
+    return hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+
+def _is_gpu_index(index: "faiss.Index") -> bool:
+    """
+    Check whether a FAISS index lives on a GPU.
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        True for GPU indexes, including ID maps over one
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    return hasattr(faiss, "GpuIndex") and isinstance(index, faiss.GpuIndex)
+
+
+def _write_atomic(path: Path, write: Callable[[str], None]) -> None:
+    """
+    Write a file through a temporary sibling and move it into place.
+
+    A store loaded with mmap keeps reading the old file until it is
+    replaced, so saving back to the directory it was loaded from is safe.
+
+    Args:
+        path: File to write
+        write: Callable writing the contents to the filename it is given
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        write(str(tmp))
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
 class VectorStore:
     """
     In-memory vector store for semantic search over documents.
+
+    Documents are stored as parallel arrays (struct of arrays): one
+    contiguous matrix of L2-normalized embeddings plus lists of ids,
+    contents and metadata. A search is a single matrix-vector product,
+    and VectorDocument objects are only built for the results.
+
+    Embeddings are stored as float32 by default. float16 storage halves
+    memory again; scores are still accumulated in float32.
+
+    With faiss installed, searches can instead go through a FAISS index:
+    "flat" (IndexFlatIP, exact), "hnsw" (IndexHNSWFlat, approximate) or
+    "ivfpq" (IndexIVFPQ, approximate over product-quantized codes). The
+    matrix stays the source of truth. Each vector gets a FAISS label when
+    it is added to the index, and the label follows its row when rows
+    move, so adds, replacements and deletes update the index in place.
+    HNSW cannot remove vectors: deleted ones stay in the graph, are
+    filtered out of results, and the index is rebuilt from the matrix
+    once they exceed a quarter of it. An "ivfpq" index needs training
+    data, so searches stay exact until the store holds ivf_train_size
+    documents. When a CUDA build of faiss sees a GPU, indexes are placed
+    on it (HNSW has no GPU implementation and stays on the CPU).
     """
 
-    def __init__(self, dimension: int = 1536):
+    def __init__(
+        self,
+        dimension: int = 1536,
+        initial_capacity: int = 64,
+        dtype: Union[str, np.dtype] = np.float32,
+        index_type: str = "exact",
+        hnsw_m: int = 32,
+        nlist: int = 100,
+        pq_m: int = 8,
+        nprobe: int = 10,
+        ivf_train_size: Optional[int] = None,
+        use_gpu: bool = True
+    ):
         """
         Initialize the vector store.
 
         Args:
             dimension: Embedding dimension size
+            initial_capacity: Rows preallocated for embeddings (grows by doubling)
+            dtype: Storage dtype for embeddings, float32 or float16
+            index_type: Search backend, one of INDEX_TYPES
+            hnsw_m: Neighbors per node for the "hnsw" index
+            nlist: Inverted lists (clusters) for the "ivfpq" index
+            pq_m: Sub-quantizers per vector for "ivfpq"; must divide dimension
+            nprobe: Clusters visited per "ivfpq" search
+            ivf_train_size: Documents needed before "ivfpq" is trained
+                (default: FAISS's k-means minimum of 39 points per
+                centroid, for both the nlist clusters and the 256
+                codes of each sub-quantizer)
+            use_gpu: Place the FAISS index on GPU 0 when one is available
         """
         self.dimension = dimension
-        self.documents: List[VectorDocument] = []
-        self.index_to_id: Dict[int, str] = {}
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported embedding dtype: {self.dtype}")
+
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type}; expected one of {INDEX_TYPES}")
+        if index_type != "exact" and faiss is None:
+            raise ImportError(f"index_type={index_type!r} requires faiss: pip install faiss-cpu")
+        if index_type == "ivfpq" and dimension % pq_m:
+            raise ValueError(f"pq_m={pq_m} must divide the dimension {dimension}")
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        self.ivf_train_size = ivf_train_size or 39 * max(nlist, 256)
+        self.use_gpu = use_gpu and faiss is not None and _gpu_available()
+
+        # FAISS index over the matrix rows; stale when it must be rebuilt
+        self._index = self._new_index()
+        self._index_stale = False
+        # Memory-mapped index file that must be re-read before writing
+        self._index_file: Optional[str] = None
+
+        # Normalized embeddings; only the first _n rows are in use
+        self._matrix = np.empty((max(1, initial_capacity), dimension), dtype=self.dtype)
+        self._ids: List[str] = []
+        self._contents: List[str] = []
+        self._metas: List[Dict[str, Any]] = []
+        self._id_to_idx: Dict[str, int] = {}
+        self._n = 0
+
+        # FAISS label of each row and row of each label (-1: not indexed)
+        self._row_labels = np.full(self._matrix.shape[0], -1, dtype=np.int64)
+        self._label_rows = np.full(self._matrix.shape[0], -1, dtype=np.int64)
+        self._next_label = 0
+        # Deleted vectors still in an HNSW graph
+        self._dead = 0
+
+        self._warm_up()
 
     def add_document(
         self,
@@ -41,24 +230,317 @@ class VectorStore:
         """
         Add a document with its embedding to the store.
 
+        Adding an ID that is already stored replaces that document.
+
         Args:
             doc_id: Unique document identifier
             content: Document text content
             embedding: Vector embedding
             metadata: Optional metadata
         """
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
         if embedding.shape[0] != self.dimension:
             raise ValueError(f"Embedding dimension mismatch: expected {self.dimension}, got {embedding.shape[0]}")
 
-        doc = VectorDocument(
-            id=doc_id,
-            content=content,
-            embedding=embedding,
-            metadata=metadata or {}
-        )
+        idx = self._id_to_idx.get(doc_id)
+        if idx is None:
+            if self._n == self._matrix.shape[0]:
+                self._grow()
+            idx = self._n
+            self._n += 1
+            self._ids.append(doc_id)
+            self._contents.append(content)
+            self._metas.append(metadata or {})
+            self._id_to_idx[doc_id] = idx
+        else:
+            self._contents[idx] = content
+            self._metas[idx] = metadata or {}
+            self._index_remove(idx)
+
+        # Normalize in float32 before narrowing to the storage dtype
+        norm = np.linalg.norm(embedding)
+        self._matrix[idx] = embedding / norm if norm > 0 else embedding
+        self._index_add(idx, idx + 1)
+
+    def add_documents(
+        self,
+        doc_ids: List[str],
+        contents: List[str],
+        embeddings: Union[np.ndarray, List[np.ndarray]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Add a batch of documents with their embeddings to the store.
+
+        Args:
+            doc_ids: Unique document identifiers
+            contents: Document text contents
+            embeddings: One embedding per document
+            metadatas: Optional metadata per document
+        """
+        if metadatas is None:
+            metadatas = [None] * len(doc_ids)
+
+        if not len(doc_ids) == len(contents) == len(embeddings) == len(metadatas):
+            raise ValueError("doc_ids, contents, embeddings and metadatas must have the same length")
+
+        if len(doc_ids) == 0:
+            return
+
+        batch = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if batch.ndim != 2 or batch.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: expected (n, {self.dimension}), got {batch.shape}"
+            )
+
+        # Replacing existing IDs needs per-document handling
+        if len(set(doc_ids)) != len(doc_ids) or any(d in self._id_to_idx for d in doc_ids):
+            for doc_id, content, embedding, metadata in zip(doc_ids, contents, embeddings, metadatas):
+                self.add_document(doc_id, content, embedding, metadata)
+            return
+
+        start = self._n
+        stop = start + len(doc_ids)
+        if stop > self._matrix.shape[0]:
+            self._grow(stop)
+
+        # Normalize the whole batch straight into the matrix
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        np.divide(batch, norms, out=self._matrix[start:stop], casting='same_kind')
+
+        self._ids.extend(doc_ids)
+        self._contents.extend(contents)
+        self._metas.extend(metadata or {} for metadata in metadatas)
+        self._id_to_idx.update(zip(doc_ids, range(start, stop)))
+        self._n = stop
+        self._index_add(start, stop)
+
+    @property
+    def index_to_id(self) -> Dict[int, str]:
+        """
+        Row index to document ID mapping, built from the stored IDs.
+
+        Returns:
+            Dictionary of row index to document ID
+        """
+        return dict(enumerate(self._ids))
+
+    def _grow(self, min_rows: int = 0) -> None:
+        """
+        Grow the embedding matrix by doubling its capacity.
+
+        Args:
+            min_rows: Minimum number of rows the matrix must hold afterwards
+        """
+        capacity = self._matrix.shape[0] * 2
+        while capacity < min_rows:
+            capacity *= 2
+
+        grown = np.empty((capacity, self.dimension), dtype=self.dtype)
+        grown[:self._n] = self._matrix[:self._n]
+        self._matrix = grown
+
+        labels = np.full(capacity, -1, dtype=np.int64)
+        labels[:self._n] = self._row_labels[:self._n]
+        self._row_labels = labels
+
+    def _new_index(self) -> Optional["faiss.Index"]:
+        """
+        Create an empty FAISS index for the configured index type.
+
+        Returns:
+            FAISS index, or None for exact NumPy search
+        """
+        if self.index_type == "flat":
+            # The ID map lets single vectors be removed by label
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+        elif self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        elif self.index_type == "ivfpq":
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFPQ(
+                quantizer, self.dimension, self.nlist, self.pq_m, 8, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            return None
+        return self._place_index(index)
+
+    def _place_index(self, index: "faiss.Index") -> "faiss.Index":
+        """
+        Apply search settings to a CPU index and move it to the GPU if enabled.
+
+        Args:
+            index: FAISS index on the CPU
+
+        Returns:
+            The index to search with
+        """
+        if self.index_type == "ivfpq":
+            index.nprobe = self.nprobe
+
+        # No GPU implementation exists for HNSW
+        if self.use_gpu and self.index_type != "hnsw":
+            try:
+                return faiss.index_cpu_to_gpu(_gpu_resources(), 0, index)
+            except RuntimeError:
+                # Configurations the GPU backend does not support stay on the CPU
+                pass
+        return index
+
+    def _warm_up(self) -> None:
+        """
+        Run a dummy search so FAISS sets up its threads and kernels now.
+
+        Keeps that one-off cost out of the first real query. Untrained
+        indexes cannot be searched and are warmed once trained.
+        """
+        if self._index is not None and self._index.is_trained:
+            self._index.search(np.zeros((1, self.dimension), dtype=np.float32), 1)
+
+    def _writable_index(self) -> None:
+        """Replace a read-only memory-mapped index with an in-memory copy."""
+        if self._index_file is not None:
+            self._index = self._place_index(faiss.read_index(self._index_file))
+            self._index_file = None
+
+    def _index_add(self, start: int, stop: int) -> None:
+        """
+        Add matrix rows [start, stop) to the FAISS index under new labels.
 
-        self.documents.append(doc)
-        self.index_to_id[len(self.documents) - 1] = doc_id
+        An untrained index is trained on every stored row once enough
+        have accumulated, and all of them are added.
+
+        Args:
+            start: First row to add
+            stop: Row after the last one to add
+        """
+        if self._index is None or self._index_stale:
+            return
+
+        self._writable_index()
+        if not self._index.is_trained:
+            if self._n < self.ivf_train_size:
+                return
+            start, stop = 0, self._n
+            self._index.train(np.ascontiguousarray(self._matrix[:self._n], dtype=np.float32))
+            self._warm_up()
+
+        vectors = np.ascontiguousarray(self._matrix[start:stop], dtype=np.float32)
+        labels = np.arange(self._next_label, self._next_label + stop - start, dtype=np.int64)
+        if self.index_type == "hnsw":
+            # HNSW labels vectors in insertion order
+            self._index.add(vectors)
+        else:
+            self._index.add_with_ids(vectors, labels)
+
+        self._next_label += len(labels)
+        if self._next_label > len(self._label_rows):
+            grown = np.full(max(self._next_label, 2 * len(self._label_rows)), -1, dtype=np.int64)
+            grown[:len(self._label_rows)] = self._label_rows
+            self._label_rows = grown
+        self._label_rows[labels] = np.arange(start, stop)
+        self._row_labels[start:stop] = labels
+
+    def _index_remove(self, idx: int) -> None:
+        """
+        Remove a row's vector from the FAISS index.
+
+        Args:
+            idx: Row index
+        """
+        if self._index is None or self._index_stale:
+            return
+
+        label = self._row_labels[idx]
+        if label < 0:
+            return
+        self._row_labels[idx] = -1
+        self._label_rows[label] = -1
+
+        if self.index_type == "hnsw":
+            # HNSW cannot remove vectors; rebuild once a quarter are dead
+            self._dead += 1
+            if 4 * self._dead > self._index.ntotal:
+                self._index_stale = True
+            return
+
+        self._writable_index()
+        try:
+            self._index.remove_ids(np.array([label], dtype=np.int64))
+        except RuntimeError:
+            # Some GPU indexes cannot remove vectors; rebuild instead
+            self._index_stale = True
+
+    def _sync_index(self) -> None:
+        """Rebuild the FAISS index from the matrix if it is stale."""
+        if self._index_stale:
+            # reset() drops the vectors but keeps any trained quantizers
+            self._writable_index()
+            self._index.reset()
+            self._index_stale = False
+            self._row_labels[:self._n] = -1
+            self._label_rows.fill(-1)
+            self._next_label = 0
+            self._dead = 0
+            self._index_add(0, self._n)
+
+    def _index_ready(self) -> bool:
+        """
+        Bring the FAISS index up to date and report whether to search it.
+
+        Returns:
+            True if searches should go through the FAISS index
+        """
+        if self._index is None:
+            return False
+        self._sync_index()
+        return self._index.is_trained
+
+    def _index_search(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        threshold: float
+    ) -> List[List[Tuple[VectorDocument, float]]]:
+        """
+        Search normalized queries with the FAISS index.
+
+        Args:
+            queries: Normalized float32 queries, shape (b, dimension)
+            top_k: Number of results to return per query
+            threshold: Minimum similarity threshold
+
+        Returns:
+            One list of (document, similarity_score) tuples per query
+        """
+        # Ask for extra hits to make up for deleted HNSW vectors
+        scores, labels = self._index.search(queries, min(top_k + self._dead, self._index.ntotal))
+        rows = np.where(labels >= 0, self._label_rows[labels], -1)
+        return [
+            [
+                (self._document(i), score)
+                for i, score in zip(row, row_scores) if i >= 0 and score >= threshold
+            ][:top_k]
+            for row, row_scores in zip(rows, scores)
+        ]
+
+    def _document(self, idx: int) -> VectorDocument:
+        """
+        Build a VectorDocument view of a stored row.
+
+        Args:
+            idx: Row index
+
+        Returns:
+            VectorDocument for that row
+        """
+        return VectorDocument(
+            id=self._ids[idx],
+            content=self._contents[idx],
+            embedding=self._matrix[idx].astype(np.float32),
+            metadata=self._metas[idx]
+        )
 
     def cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """
@@ -90,20 +572,110 @@ class VectorStore:
         Returns:
             List of (document, similarity_score) tuples
         """
-        if len(self.documents) == 0:
+        if self._n == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+
+        query = query / query_norm
+        if self._index_ready():
+            return self._index_search(query[None], top_k, threshold)[0]
+
+        scores = self._scores(query)
+        return [(self._document(i), scores[i]) for i in self._select_top_k(scores, top_k, threshold)]
+
+    def batch_search(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 5,
+        threshold: float = 0.0
+    ) -> List[List[Tuple[VectorDocument, float]]]:
+        """
+        Search for several queries at once.
+
+        All queries are scored against the store in a single
+        matrix-matrix product (or one FAISS search call) instead of one
+        search per query.
+
+        Args:
+            query_embeddings: Query embeddings, one per row
+            top_k: Number of results to return per query
+            threshold: Minimum similarity threshold
+
+        Returns:
+            One list of (document, similarity_score) tuples per query
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.size == 0:
             return []
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: expected (n, {self.dimension}), got {queries.shape}"
+            )
+        if self._n == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms > 0, norms, 1.0)
+        if self._index_ready():
+            # One FAISS call for the whole batch; zero queries match nothing
+            results = self._index_search(queries, top_k, threshold)
+            return [hits if norm > 0 else [] for hits, norm in zip(results, norms[:, 0])]
+
+        scores = self._scores(queries)
+        # Zero queries match nothing
+        scores[norms[:, 0] == 0] = -np.inf
+
+        top, top_scores = _top_k_rows(scores, top_k, threshold)
+        return [
+            [(self._document(i), score) for i, score in zip(row, row_scores) if score >= threshold]
+            for row, row_scores in zip(top, top_scores)
+        ]
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """
+        Score normalized queries against every stored document.
 
-        # Calculate similarities
-        similarities = []
-        for doc in self.documents:
-            similarity = self.cosine_similarity(query_embedding, doc.embedding)
-            if similarity >= threshold:
-                similarities.append((doc, similarity))
+        Args:
+            queries: Normalized float32 query vector or (b, dimension) matrix
+
+        Returns:
+            Cosine similarities, shape (n,) or (b, n)
+        """
+        matrix = self._matrix[:self._n]
+        if self.dtype == np.float32:
+            # Cosine similarity against every document in one BLAS call
+            return queries @ matrix.T
+        # No half-precision BLAS; einsum upcasts and accumulates in float32
+        return np.einsum('nd,...d->...n', matrix, queries, dtype=np.float32)
+
+    def _select_top_k(self, scores: np.ndarray, top_k: int, threshold: float) -> np.ndarray:
+        """
+        Pick the indices of the best scores above a threshold.
 
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            scores: Similarity per stored document
+            top_k: Maximum number of indices to return
+            threshold: Minimum similarity threshold
 
-        return similarities[:top_k]
+        Returns:
+            Row indices ordered by descending score
+        """
+        # Drop rows under the threshold, then partially sort the rest so
+        # only the top k candidates get ordered
+        candidates = np.flatnonzero(scores >= threshold)
+        k = min(top_k, candidates.size)
+        if k == 0:
+            return candidates[:0]
+        if k < candidates.size:
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        else:
+            # Every candidate is returned; partitioning would not narrow anything
+            top = candidates
+        return top[np.argsort(-scores[top])]
 
     def get_by_id(self, doc_id: str) -> Optional[VectorDocument]:
         """
@@ -115,10 +687,8 @@ class VectorStore:
         Returns:
             VectorDocument or None if not found
         """
-        for doc in self.documents:
-            if doc.id == doc_id:
-                return doc
-        return None
+        idx = self._id_to_idx.get(doc_id)
+        return None if idx is None else self._document(idx)
 
     def delete(self, doc_id: str) -> bool:
         """
@@ -130,18 +700,158 @@ class VectorStore:
         Returns:
             True if deleted, False if not found
         """
-        for i, doc in enumerate(self.documents):
-            if doc.id == doc_id:
-                del self.documents[i]
-                # Rebuild index
-                self.index_to_id = {j: d.id for j, d in enumerate(self.documents)}
-                return True
-        return False
+        idx = self._id_to_idx.pop(doc_id, None)
+        if idx is None:
+            return False
+        self._index_remove(idx)
+
+        # Move the last document into the freed slot so nothing shifts;
+        # its FAISS label moves with it
+        last = self._n - 1
+        if idx != last:
+            moved_id = self._ids[last]
+            self._matrix[idx] = self._matrix[last]
+            self._ids[idx] = moved_id
+            self._contents[idx] = self._contents[last]
+            self._metas[idx] = self._metas[last]
+            self._id_to_idx[moved_id] = idx
+            label = self._row_labels[last]
+            self._row_labels[idx] = label
+            if label >= 0:
+                self._label_rows[label] = idx
+
+        self._row_labels[last] = -1
+        self._ids.pop()
+        self._contents.pop()
+        self._metas.pop()
+        self._n -= 1
+        return True
 
     def clear(self) -> None:
         """Clear all documents from the store."""
-        self.documents.clear()
-        self.index_to_id.clear()
+        self._ids.clear()
+        self._contents.clear()
+        self._metas.clear()
+        self._id_to_idx.clear()
+        self._n = 0
+        self._index = self._new_index()
+        self._index_stale = False
+        self._index_file = None
+        self._row_labels.fill(-1)
+        self._label_rows.fill(-1)
+        self._next_label = 0
+        self._dead = 0
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Persist the store to a directory.
+
+        Writes the embedding matrix as vectors.npy, ids, contents,
+        metadata and settings as documents.pkl, and the FAISS index (if
+        any) as index.faiss, so a trained index need not be rebuilt.
+        Files are replaced atomically, so a store may be saved back to
+        the directory it was loaded (and memory mapped) from.
+
+        Args:
+            path: Directory to write to (created if missing)
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if self._index is not None:
+            # A memory-mapped IVF index cannot be written back out as is
+            self._writable_index()
+            # Saved labels must match the saved index
+            self._sync_index()
+
+        def write_vectors(filename: str) -> None:
+            # A file object stops np.save from appending ".npy" to the name
+            with open(filename, "wb") as f:
+                np.save(f, self._matrix[:self._n])
+
+        _write_atomic(path / "vectors.npy", write_vectors)
+        state = {
+            'config': {
+                'dimension': self.dimension,
+                'dtype': self.dtype.name,
+                'index_type': self.index_type,
+                'hnsw_m': self.hnsw_m,
+                'nlist': self.nlist,
+                'pq_m': self.pq_m,
+                'nprobe': self.nprobe,
+                'ivf_train_size': self.ivf_train_size
+            },
+            'ids': self._ids,
+            'contents': self._contents,
+            'metadatas': self._metas,
+            'labels': self._row_labels[:self._n].copy(),
+            'next_label': self._next_label,
+            'dead': self._dead
+        }
+
+        def write_documents(filename: str) -> None:
+            with open(filename, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        _write_atomic(path / "documents.pkl", write_documents)
+
+        if self._index is not None:
+            index = self._index
+            if _is_gpu_index(index):
+                index = faiss.index_gpu_to_cpu(index)
+            _write_atomic(path / "index.faiss", lambda filename: faiss.write_index(index, filename))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "VectorStore":
+        """
+        Load a store written by save().
+
+        With mmap, the embedding matrix and the FAISS index are memory
+        mapped so pages are read on demand rather than up front. The
+        matrix is mapped copy-on-write; a memory-mapped index is copied
+        into memory the first time documents are added or removed.
+
+        Args:
+            path: Directory written by save()
+            mmap: Memory-map the saved files instead of reading them fully
+
+        Returns:
+            VectorStore instance
+        """
+        path = Path(path)
+        with open(path / "documents.pkl", "rb") as f:
+            state = pickle.load(f)
+
+        store = cls(**state['config'])
+        ids = state['ids']
+        if ids:
+            store._matrix = np.load(path / "vectors.npy", mmap_mode='c' if mmap else None)
+            store._row_labels = np.full(len(ids), -1, dtype=np.int64)
+        store._ids = ids
+        store._contents = state['contents']
+        store._metas = state['metadatas']
+        store._id_to_idx = {doc_id: i for i, doc_id in enumerate(ids)}
+        store._n = len(ids)
+
+        index_file = path / "index.faiss"
+        if store._index is not None:
+            if index_file.exists() and 'labels' in state:
+                flags = faiss.IO_FLAG_MMAP if mmap else 0
+                store._index = store._place_index(faiss.read_index(str(index_file), flags))
+                if mmap and not _is_gpu_index(store._index):
+                    store._index_file = str(index_file)
+                # __init__ warmed the empty index this one replaces
+                store._warm_up()
+
+                store._row_labels[:store._n] = state['labels']
+                store._next_label = state['next_label']
+                store._dead = state['dead']
+                store._label_rows = np.full(max(1, store._next_label), -1, dtype=np.int64)
+                indexed = np.flatnonzero(store._row_labels[:store._n] >= 0)
+                store._label_rows[store._row_labels[indexed]] = indexed
+            else:
+                store._index_stale = True
+
+        return store
 
     def size(self) -> int:
         """
@@ -150,4 +860,4 @@ class VectorStore:
         Returns:
             Number of documents
         """
-        return len(self.documents)
+        return self._n
@@ -1,95 +1,311 @@
 """
 Vision model integration for analyzing images and visual content.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
+import asyncio
+import json
 import os
-from openai import OpenAI
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from io import BytesIO
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from PIL import Image
+import pybase64
+from src.cache import CacheManager
+from src.image_processor import ImageProcessor
+from src.openai_client import get_client
 
 load_dotenv()
 
+DEFAULT_PROMPT = "Describe this image in detail, including any text, diagrams, charts, or important visual elements."
+
+DIAGRAM_PROMPT = """Analyze this diagram or chart. Provide:
+        1. Type of visual (chart, diagram, flowchart, etc.)
+        2. Main components or elements
+        3. Key data or information presented
+        4. Any text labels or annotations
+        """
+
+# Longest image side sent to the API; larger images are downscaled
+MAX_IMAGE_SIDE = 2048
+
+# Base64 characters decoded to read an image header (48 KB of data)
+_HEADER_CHARS = 1 << 16
+
+# Batch jobs that will not produce any more output
+_BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _image_size(payload: str) -> Optional[Tuple[int, int]]:
+    """
+    Read the dimensions of a base64 encoded image.
+
+    Only a prefix of the payload is decoded, which is enough for the
+    header of common formats; the whole payload is decoded only if the
+    prefix does not hold a readable header (e.g. large JPEG metadata).
+
+    Args:
+        payload: Base64 encoded image
+
+    Returns:
+        (width, height), or None if Pillow cannot read the image or
+        rejects it as a decompression bomb
+    """
+    chunks = (payload[:_HEADER_CHARS], payload) if len(payload) > _HEADER_CHARS else (payload,)
+    for chunk in chunks:
+        try:
+            with Image.open(BytesIO(pybase64.b64decode(chunk))) as image:
+                return image.size
+        except Image.DecompressionBombError:
+            return None
+        except (ValueError, OSError):
+            continue
+    return None
+
+
+def _image_url(image_base64: str, mime_type: str = "image/jpeg") -> str:
+    """
+    Build the data URL sent to the API, downscaling oversized images.
+
+    Images with a side longer than MAX_IMAGE_SIDE are shrunk to fit and
+    re-encoded as JPEG, which cuts upload size and image tokens. Smaller
+    images, and payloads Pillow cannot read or refuses to decode, are
+    sent unchanged.
+
+    Args:
+        image_base64: Base64 encoded image or a complete data URL
+        mime_type: MIME type used when building the data URL
+
+    Returns:
+        Data URL
+    """
+    if image_base64.startswith("data:"):
+        url = image_base64
+        payload = image_base64.partition(",")[2]
+    else:
+        url = None
+        payload = image_base64
+
+    size = _image_size(payload)
+    if size is not None and max(size) > MAX_IMAGE_SIDE:
+        try:
+            processor = ImageProcessor()
+            image = Image.open(BytesIO(pybase64.b64decode(payload)))
+            image = processor.resize_image(image, (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+            return f"data:image/jpeg;base64,{processor.image_to_base64(image, 'JPEG', quality=85)}"
+        except (ValueError, OSError, Image.DecompressionBombError):
+            # Truncated or otherwise undecodable pixel data
+            pass
+    return url or f"data:{mime_type};base64,{image_base64}"
+
+
+class VisionImage:
+    """
+    Image payload for vision requests.
+
+    Preparing the data URL reads the image header (to downscale it if
+    needed) and copies the whole base64 payload, so wrap an image in a VisionImage
+    when sending it with several prompts (e.g. extract_text_from_image,
+    analyze_diagram, then questions); the URL is then built once and
+    reused.
+    """
+
+    def __init__(self, image_base64: str, mime_type: str = "image/jpeg"):
+        """
+        Initialize the image.
+
+        Args:
+            image_base64: Base64 encoded image or a complete data URL
+            mime_type: MIME type used when building the data URL
+        """
+        self.image_base64 = image_base64
+        self.mime_type = mime_type
+
+    @cached_property
+    def data_url(self) -> str:
+        """Data URL for the image, prepared on first access."""
+        return _image_url(self.image_base64, self.mime_type)
+
+
+# Base64 string, data URL string, or VisionImage
+ImageInput = Union[str, VisionImage]
+
+
+def _data_url(image: ImageInput) -> str:
+    """
+    Get the data URL for an image input.
+
+    Args:
+        image: Base64 encoded image, data URL or VisionImage
+
+    Returns:
+        Data URL
+    """
+    if isinstance(image, VisionImage):
+        return image.data_url
+    return _image_url(image)
+
+
+def _payload(image: ImageInput) -> str:
+    """
+    Get the string identifying an image input in cache keys.
+
+    Args:
+        image: Base64 encoded image, data URL or VisionImage
+
+    Returns:
+        The wrapped or given string
+    """
+    return image.image_base64 if isinstance(image, VisionImage) else image
+
+
+def _image_messages(image_base64: ImageInput, prompt: str) -> List[Dict[str, Any]]:
+    """
+    Build the chat messages for a prompt about one image.
+
+    Args:
+        image_base64: Base64 encoded image, data URL or VisionImage
+        prompt: Prompt for analysis
+
+    Returns:
+        Chat completion messages
+    """
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": _data_url(image_base64)
+                    }
+                }
+            ]
+        }
+    ]
+
 
 class VisionModel:
     """Wrapper for GPT-4 Vision model to analyze images."""
 
-    def __init__(self, model_name: str = None, api_key: str = None):
+    def __init__(
+        self,
+        model_name: str = None,
+        api_key: str = None,
+        cache: Optional[CacheManager] = None
+    ):
         """
         Initialize the vision model.
 
         Args:
             model_name: Name of the vision model to use
             api_key: OpenAI API key
+            cache: Optional cache for analyses, keyed by image content,
+                prompt and model
         """
         self.model_name = model_name or os.getenv('MODEL_NAME', 'gpt-4-vision-preview')
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
+        self.cache = cache
 
-    def analyze_image(self, image_base64: str, prompt: str = None) -> str:
+    def analyze_image(
+        self,
+        image_base64: ImageInput,
+        prompt: str = None,
+        max_tokens: int = 1000
+    ) -> str:
         """
         Analyze an image using the vision model.
 
         Args:
-            image_base64: Base64 encoded image
+            image_base64: Base64 encoded image, data URL or VisionImage
             prompt: Optional prompt for analysis
+            max_tokens: Maximum tokens to generate
 
         Returns:
             Analysis result from the model
         """
         if prompt is None:
-            prompt = "Describe this image in detail, including any text, diagrams, charts, or important visual elements."
+            prompt = DEFAULT_PROMPT
+
+        if self.cache is not None:
+            cached = self.cache.get_cached_vision_result(
+                _payload(image_base64), prompt, self.model_name, max_tokens
+            )
+            if cached is not None:
+                return cached
 
         response = self.client.chat.completions.create(
             model=self.model_name,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}"
-                            }
-                        }
-                    ]
-                }
-            ],
-            max_tokens=1000
+            messages=_image_messages(image_base64, prompt),
+            max_tokens=max_tokens
         )
 
-        return response.choices[0].message.content
+        result = response.choices[0].message.content
+        if self.cache is not None and result is not None:
+            self.cache.cache_vision_result(
+                _payload(image_base64), prompt, self.model_name, result, max_tokens
+            )
+        return result
+
+    def analyze_images(
+        self,
+        images_base64: List[ImageInput],
+        prompt: str = None,
+        max_workers: int = 10,
+        max_tokens: int = 1000
+    ) -> List[str]:
+        """
+        Analyze several images concurrently from synchronous code.
+
+        API calls are I/O bound, so a thread pool overlaps their latency.
+
+        Args:
+            images_base64: Base64 encoded images, data URLs or VisionImages
+            prompt: Optional prompt for analysis
+            max_workers: Maximum concurrent requests
+            max_tokens: Maximum tokens to generate per image
+
+        Returns:
+            Analysis results in input order
+        """
+        if not images_base64:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(images_base64))) as executor:
+            return list(executor.map(
+                lambda image: self.analyze_image(image, prompt, max_tokens), images_base64
+            ))
 
-    def extract_text_from_image(self, image_base64: str) -> str:
+    def extract_text_from_image(self, image_base64: ImageInput, max_tokens: int = 2000) -> str:
         """
         Extract text content from an image using OCR.
 
         Args:
-            image_base64: Base64 encoded image
+            image_base64: Base64 encoded image, data URL or VisionImage
+            max_tokens: Maximum tokens to generate; text-heavy pages run long
 
         Returns:
             Extracted text
         """
         prompt = "Extract all text from this image. Return only the text content, preserving formatting where possible."
-        return self.analyze_image(image_base64, prompt)
+        return self.analyze_image(image_base64, prompt, max_tokens)
 
-    def analyze_diagram(self, image_base64: str) -> Dict[str, Any]:
+    def analyze_diagram(self, image_base64: ImageInput, max_tokens: int = 800) -> Dict[str, Any]:
         """
         Analyze diagrams, charts, and visual elements.
 
         Args:
-            image_base64: Base64 encoded image
+            image_base64: Base64 encoded image, data URL or VisionImage
+            max_tokens: Maximum tokens to generate
 
         Returns:
             Dictionary containing analysis results
         """
-        prompt = """Analyze this diagram or chart. Provide:
-        1. Type of visual (chart, diagram, flowchart, etc.)
-        2. Main components or elements
-        3. Key data or information presented
-        4. Any text labels or annotations
-        """
-
-        analysis = self.analyze_image(image_base64, prompt)
+        analysis = self.analyze_image(image_base64, DIAGRAM_PROMPT, max_tokens)
 
         return {
             'type': 'diagram_analysis',
@@ -97,15 +313,213 @@ class VisionModel:
             'model': self.model_name
         }
 
-    def answer_question_about_image(self, image_base64: str, question: str) -> str:
+    def analyze_diagrams_batch(
+        self,
+        images_base64: List[ImageInput],
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        max_tokens: int = 800
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze many diagrams through the OpenAI Batch API.
+
+        Meant for offline ingestion: batch jobs cost about half as much as
+        real-time requests and do not count against real-time rate limits,
+        but may take up to 24 hours. Cached images are not resubmitted.
+
+        Args:
+            images_base64: Base64 encoded images, data URLs or VisionImages
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch (None waits
+                for the 24 hour completion window)
+            max_tokens: Maximum tokens to generate per diagram
+
+        Returns:
+            Analysis dictionaries in input order, shaped like
+            analyze_diagram's; 'analysis' is None for requests that failed
+        """
+        analyses: List[Optional[str]] = [None] * len(images_base64)
+        pending = []
+        for i, image_base64 in enumerate(images_base64):
+            if self.cache is not None:
+                analyses[i] = self.cache.get_cached_vision_result(
+                    _payload(image_base64), DIAGRAM_PROMPT, self.model_name, max_tokens
+                )
+            if analyses[i] is None:
+                pending.append(i)
+
+        if pending:
+            requests = "\n".join(
+                json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model_name,
+                        "messages": _image_messages(images_base64[i], DIAGRAM_PROMPT),
+                        "max_tokens": max_tokens
+                    }
+                })
+                for i in pending
+            )
+            input_file = self.client.files.create(
+                file=("diagrams.jsonl", requests.encode()),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while batch.status not in _BATCH_FINAL_STATUSES:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Batch {batch.id} still {batch.status} after {timeout}s")
+                time.sleep(poll_interval)
+                batch = self.client.batches.retrieve(batch.id)
+
+            if batch.output_file_id is None:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status} and no output")
+
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+
+                i = int(record["custom_id"])
+                analyses[i] = response["body"]["choices"][0]["message"]["content"]
+                if self.cache is not None and analyses[i] is not None:
+                    self.cache.cache_vision_result(
+                        _payload(images_base64[i]), DIAGRAM_PROMPT, self.model_name,
+                        analyses[i], max_tokens
+                    )
+
+        return [
+            {
+                'type': 'diagram_analysis',
+                'analysis': analysis,
+                'model': self.model_name
+            }
+            for analysis in analyses
+        ]
+
+    def answer_question_about_image(
+        self,
+        image_base64: ImageInput,
+        question: str,
+        max_tokens: int = 200
+    ) -> str:
         """
         Answer a specific question about an image.
 
         Args:
-            image_base64: Base64 encoded image
+            image_base64: Base64 encoded image, data URL or VisionImage
             question: Question to answer
+            max_tokens: Maximum tokens to generate; answers are short
 
         Returns:
             Answer from the model
         """
-        return self.analyze_image(image_base64, question)
+        return self.analyze_image(image_base64, question, max_tokens)
+
+
+class AsyncVisionModel:
+    """
+    Asyncio wrapper for the vision model, for analyzing many images at once.
+
+    Requests run concurrently up to max_concurrency; transient API errors
+    are retried with exponential backoff by the OpenAI client.
+    """
+
+    def __init__(
+        self,
+        model_name: str = None,
+        api_key: str = None,
+        cache: Optional[CacheManager] = None,
+        max_concurrency: int = 10,
+        max_retries: int = 3
+    ):
+        """
+        Initialize the async vision model.
+
+        Args:
+            model_name: Name of the vision model to use
+            api_key: OpenAI API key
+            cache: Optional cache for analyses, shared with VisionModel
+            max_concurrency: Maximum requests in flight
+            max_retries: Retries for rate limits, timeouts and server errors
+        """
+        self.model_name = model_name or os.getenv('MODEL_NAME', 'gpt-4-vision-preview')
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.client = AsyncOpenAI(api_key=self.api_key, max_retries=max_retries)
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+
+    async def analyze_image(
+        self,
+        image_base64: ImageInput,
+        prompt: str = None,
+        max_tokens: int = 1000
+    ) -> str:
+        """
+        Analyze an image using the vision model.
+
+        Args:
+            image_base64: Base64 encoded image, data URL or VisionImage
+            prompt: Optional prompt for analysis
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Analysis result from the model
+        """
+        if prompt is None:
+            prompt = DEFAULT_PROMPT
+
+        if self.cache is not None:
+            cached = self.cache.get_cached_vision_result(
+                _payload(image_base64), prompt, self.model_name, max_tokens
+            )
+            if cached is not None:
+                return cached
+
+        response = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=_image_messages(image_base64, prompt),
+            max_tokens=max_tokens
+        )
+
+        result = response.choices[0].message.content
+        if self.cache is not None and result is not None:
+            self.cache.cache_vision_result(
+                _payload(image_base64), prompt, self.model_name, result, max_tokens
+            )
+        return result
+
+    async def analyze_images(
+        self,
+        images_base64: List[ImageInput],
+        prompt: str = None,
+        max_tokens: int = 1000
+    ) -> List[str]:
+        """
+        Analyze several images concurrently.
+
+        Args:
+            images_base64: Base64 encoded images, data URLs or VisionImages
+            prompt: Optional prompt for analysis
+            max_tokens: Maximum tokens to generate per image
+
+        Returns:
+            Analysis results in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def analyze_one(image_base64: ImageInput) -> str:
+            async with semaphore:
+                return await self.analyze_image(image_base64, prompt, max_tokens)
+
+        return await asyncio.gather(*(analyze_one(image) for image in images_base64))
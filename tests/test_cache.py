@@ -0,0 +1,132 @@
+"""
+Unit tests for cache manager.
+"""
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.cache import CacheManager
+
+
+class TestCacheManager(unittest.TestCase):
+    """Test cases for CacheManager class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(cache_dir=self.tmp_dir.name, ttl=3600)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_embedding_roundtrip(self):
+        """Test caching and retrieving an embedding."""
+        embedding = np.arange(128, dtype=np.float32)
+        self.cache.cache_embedding("some text", embedding)
+
+        cached = self.cache.get_cached_embedding("some text")
+        np.testing.assert_array_equal(cached, embedding)
+        self.assertTrue(cached.flags.writeable)
+
+    def test_response_roundtrip(self):
+        """Test caching and retrieving a response."""
+        self.cache.cache_response("query", "context", "answer")
+
+        self.assertEqual(self.cache.get_cached_response("query", "context"), "answer")
+        self.assertIsNone(self.cache.get_cached_response("query", "other context"))
+
+        params = {"model": "gpt-4", "temperature": 0.7}
+        self.cache.cache_response("query", "context", "tuned answer", params)
+        self.assertEqual(self.cache.get_cached_response("query", "context", params), "tuned answer")
+        self.assertEqual(self.cache.get_cached_response("query", "context"), "answer")
+
+    def test_vision_result_roundtrip(self):
+        """Test that vision results are keyed by image, prompt, model and token limit."""
+        self.cache.cache_vision_result("aW1hZ2U=", "describe", "gpt-4o", "a cat", max_tokens=200)
+
+        self.assertEqual(
+            self.cache.get_cached_vision_result("aW1hZ2U=", "describe", "gpt-4o", max_tokens=200), "a cat"
+        )
+        self.assertIsNone(self.cache.get_cached_vision_result("aW1hZ2U=", "describe", "gpt-4o", max_tokens=800))
+        self.assertIsNone(self.cache.get_cached_vision_result("aW1hZ2U=", "describe", "gpt-4o"))
+
+    def test_query_result_roundtrip(self):
+        """Test query results, including values msgpack cannot encode."""
+        result = {"answer": "42", "sources": [{"doc_id": "d1", "score": 0.9}]}
+        self.cache.cache_query_result("query", result)
+        self.assertEqual(self.cache.get_cached_query("query"), result)
+
+        result = {"score": np.float32(0.5)}
+        self.cache.cache_query_result("numpy query", result)
+        self.assertEqual(self.cache.get_cached_query("numpy query"), result)
+
+    def test_keys_distinguish_types(self):
+        """Test that equal-looking values of different types get different keys."""
+        values = [1, "1", 1.0, True, "True", None, "None", [1], ["1"]]
+        keys = {self.cache._generate_key({"a": value}) for value in values}
+        self.assertEqual(len(keys), len(values))
+
+    def test_values_not_shared_with_callers(self):
+        """Test that cached values are copies, typed the same from memory or disk."""
+        result = {"answer": "42", "sources": ("d1", "d2")}
+        self.cache.cache_query_result("query", result)
+        result["answer"] = "mutated"
+
+        cached = self.cache.get_cached_query("query")
+        self.assertEqual(cached, {"answer": "42", "sources": ["d1", "d2"]})
+        cached["answer"] = "mutated"
+        self.assertEqual(self.cache.get_cached_query("query")["answer"], "42")
+
+        self.cache._memory.clear()
+        self.assertEqual(self.cache.get_cached_query("query"), {"answer": "42", "sources": ["d1", "d2"]})
+
+    def test_missing_key(self):
+        """Test retrieving a key that was never cached."""
+        self.assertIsNone(self.cache.get_cached_query("unknown"))
+
+    def test_expired_entries(self):
+        """Test expiry and cleanup of stale entries."""
+        self.cache.ttl = 0
+        self.cache.cache_query_result("query", {"answer": "42"})
+        time.sleep(0.01)
+
+        self.assertIsNone(self.cache.get_cached_query("query"))
+        self.assertEqual(self.cache.get_stats()['queries'], {'total': 1, 'expired': 1})
+        self.assertEqual(self.cache.clear_expired(), 1)
+        self.assertEqual(self.cache.get_stats()['queries']['total'], 0)
+
+    def test_clear_category(self):
+        """Test clearing a single category."""
+        self.cache.cache_query_result("q1", "r1")
+        self.cache.cache_query_result("q2", "r2")
+        self.cache.cache_response("q1", "ctx", "r1")
+
+        self.assertEqual(self.cache.clear_category("queries"), 2)
+        self.assertEqual(self.cache.get_stats()['responses']['total'], 1)
+        self.assertIsNone(self.cache.get_cached_query("q1"))
+
+    def test_reopen_after_cache_cleared(self):
+        """Test that a new manager recreates a cache removed from disk."""
+        self.cache.close()
+        shutil.rmtree(self.tmp_dir.name)
+
+        self.cache = CacheManager(cache_dir=self.tmp_dir.name, ttl=3600)
+        self.cache.cache_query_result("query", "result")
+        self.assertEqual(self.cache.get_cached_query("query"), "result")
+
+    def test_memory_lru_bound(self):
+        """Test the in-process LRU stays bounded and falls back to disk."""
+        self.cache.memory_size = 2
+        for i in range(5):
+            self.cache.cache_query_result(f"q{i}", f"r{i}")
+
+        self.assertEqual(len(self.cache._memory), 2)
+        self.assertEqual(self.cache.get_cached_query("q0"), "r0")
+        self.assertIn(("queries", self.cache._generate_key("q0")), self.cache._memory)
+
+
+if __name__ == '__main__':
+    unittest.main()
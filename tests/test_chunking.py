@@ -1,10 +1,22 @@
 """
 Unit tests for document chunking.
 """
+import time
 import unittest
+from hypothesis import given, settings, strategies as st
 from src.chunking import DocumentChunker
 
 
+def _best_time(func, repeat: int = 3) -> float:
+    """Return the fastest of several timed calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
 class TestDocumentChunker(unittest.TestCase):
     """Test cases for DocumentChunker class."""
 
@@ -29,6 +41,15 @@ class TestDocumentChunker(unittest.TestCase):
         self.assertEqual(len(chunks), 1)
         self.assertEqual(chunks[0], text)
 
+    def test_chunk_breaks_at_sentence_boundary(self):
+        """Test that chunks end on the last sentence boundary in the window."""
+        chunker = DocumentChunker(chunk_size=40, chunk_overlap=0)
+        text = "Première phrase ici. Deuxième phrase qui continue longtemps sans fin"
+        chunks = chunker.chunk_by_tokens(text)
+
+        self.assertEqual(chunks[0], "Première phrase ici.")
+        self.assertTrue(chunks[1].startswith("Deuxième phrase"))
+
     def test_chunk_document(self):
         """Test document chunking with metadata."""
         text = "This is a test. " * 20  # Create longer text
@@ -39,6 +60,38 @@ class TestDocumentChunker(unittest.TestCase):
         self.assertIn('text', result[0])
         self.assertIn('chunk_id', result[0])
 
+    @settings(max_examples=200, deadline=None)
+    @given(
+        text=st.text(alphabet=st.sampled_from("ab .\né"), max_size=2000),
+        chunk_size=st.integers(min_value=1, max_value=120),
+        overlap=st.integers(min_value=0, max_value=150)
+    )
+    def test_chunk_by_tokens_properties(self, text, chunk_size, overlap):
+        """Test that token chunking terminates with bounded chunks of the text."""
+        chunks = DocumentChunker(chunk_size=chunk_size, chunk_overlap=overlap).chunk_by_tokens(text)
+
+        for chunk in chunks:
+            self.assertTrue(chunk)
+            self.assertEqual(chunk, chunk.strip())
+            self.assertLessEqual(len(chunk), chunk_size)
+            self.assertIn(chunk, text)
+        if text.strip():
+            self.assertTrue(chunks)
+
+    def test_large_doc_chunking_scales_linearly(self):
+        """Test that chunking time grows linearly with document length."""
+        chunker = DocumentChunker(chunk_size=500, chunk_overlap=50)
+        sentence = "This sentence is about forty characters. "
+        small = sentence * 500
+        large = sentence * 10000  # ~100k tokens at four characters per token
+
+        small_time = _best_time(lambda: chunker.chunk_by_tokens(small))
+        large_time = _best_time(lambda: chunker.chunk_by_tokens(large))
+
+        # 20x the text; allow generous slack for timer noise, but not 20^2
+        self.assertLess(large_time, max(small_time, 1e-3) * 20 * 4)
+        self.assertLess(large_time, 1.0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,7 @@
 Unit tests for document processing module.
 """
 import unittest
-from src.document_processor import PDFProcessor
+from src.document_processor import PDFProcessor, _split_pages
 
 
 class TestPDFProcessor(unittest.TestCase):
@@ -26,6 +26,11 @@ class TestPDFProcessor(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.processor.extract_text('test.txt')
 
+    def test_split_pages(self):
+        """Test splitting pages into contiguous ranges for workers."""
+        self.assertEqual(_split_pages(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(_split_pages(2, 8), [(0, 1), (1, 2)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for file handling.
+"""
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.file_handler import FileHandler
+
+
+class TestFileHandler(unittest.TestCase):
+    """Test cases for FileHandler class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.handler = FileHandler(upload_dir=self.tmp_dir.name)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmp_dir.cleanup()
+
+    def test_reopen_after_uploads_cleared(self):
+        """Test that a new handler recreates an upload directory removed from disk."""
+        shutil.rmtree(self.tmp_dir.name)
+
+        handler = FileHandler(upload_dir=self.tmp_dir.name)
+        saved = handler.save_upload(b"%PDF", "doc.pdf", "application/pdf")
+        self.assertEqual(handler.get_file_path(saved['file_id']).read_bytes(), b"%PDF")
+
+    def test_failed_stream_leaves_no_file(self):
+        """Test that an upload stream failing partway removes the partial file."""
+        async def chunks():
+            yield b"partial"
+            raise ConnectionError("client went away")
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(self.handler.save_upload_stream(chunks(), "doc.pdf", "application/pdf"))
+        self.assertEqual(self.handler.list_files(), [])
+
+    def test_delete_file(self):
+        """Test deleting a stored file."""
+        saved = self.handler.save_upload(b"%PDF", "doc.pdf", "application/pdf")
+
+        self.assertTrue(self.handler.delete_file(saved['file_id']))
+        self.assertFalse(self.handler.delete_file(saved['file_id']))
+        self.assertEqual(self.handler.list_files(), [])
+
+    def test_get_file_path_uses_index(self):
+        """Test that saved files are found through the index and filtered by category."""
+        saved = self.handler.save_upload(b"%PDF", "doc.pdf", "application/pdf")
+        expected = Path(saved['file_path'])
+
+        with mock.patch.object(Path, "glob") as glob:
+            self.assertEqual(self.handler.get_file_path(saved['file_id']), expected)
+            self.assertEqual(self.handler.get_file_path(saved['file_id'], "pdfs"), expected)
+            self.assertIsNone(self.handler.get_file_path(saved['file_id'], "images"))
+        glob.assert_not_called()
+
+    def test_get_file_path_falls_back_to_glob(self):
+        """Test that files stored by another handler are found on disk and indexed."""
+        other = FileHandler(upload_dir=self.tmp_dir.name)
+        saved = other.save_upload(b"\x89PNG", "chart.png", "image/png")
+
+        self.assertNotIn(saved['file_id'], self.handler._file_index)
+        self.assertIsNone(self.handler.get_file_path(saved['file_id'], "pdfs"))
+        file_path = self.handler.get_file_path(saved['file_id'])
+        self.assertEqual(file_path, Path(saved['file_path']))
+        self.assertEqual(self.handler._file_index[saved['file_id']], file_path)
+
+    def test_get_file_path_missing(self):
+        """Test that unknown and externally removed files are not found."""
+        self.assertIsNone(self.handler.get_file_path("missing"))
+
+        saved = self.handler.save_upload(b"%PDF", "doc.pdf", "application/pdf")
+        Path(saved['file_path']).unlink()
+        self.assertIsNone(self.handler.get_file_path(saved['file_id']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for query processing.
+"""
+import unittest
+import numpy as np
+from src.query_processor import QueryProcessor
+from src.vector_store import VectorStore
+
+
+class FixedEmbedder:
+    """Embedding generator stub returning preset query vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_queries(self, queries):
+        return np.array([self.vectors[query] for query in queries], dtype=np.float32)
+
+
+class TestQueryProcessor(unittest.TestCase):
+    """Test cases for QueryProcessor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        store = VectorStore(dimension=3)
+        store.add_documents(
+            doc_ids=["a", "b", "c"],
+            contents=["alpha", "beta", "gamma"],
+            embeddings=np.eye(3, dtype=np.float32)
+        )
+        embedder = FixedEmbedder({
+            "first": [1.0, 0.2, 0.0],
+            "second": [0.6, 0.8, 0.0],
+        })
+        self.processor = QueryProcessor(embedder, store)
+
+    def test_process_queries_keeps_best_score(self):
+        """Test that a document hit by several variants is kept once with its best score."""
+        results = self.processor.process_queries(["first", "second"], top_k=3, threshold=0.1)
+
+        self.assertEqual([r['doc_id'] for r in results], ["a", "b"])
+        self.assertAlmostEqual(results[0]['score'], 1 / np.hypot(1.0, 0.2), places=5)
+        self.assertAlmostEqual(results[1]['score'], 0.8, places=5)
+
+    def test_process_queries_limits_merged_results(self):
+        """Test that top_k applies to the merged results."""
+        results = self.processor.process_queries(["first", "second"], top_k=1, threshold=0.1)
+
+        self.assertEqual([r['doc_id'] for r in results], ["a"])
+
+    def test_process_queries_empty(self):
+        """Test that no variants give no results."""
+        self.assertEqual(self.processor.process_queries([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
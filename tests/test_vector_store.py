@@ -1,14 +1,22 @@
 """
 Unit tests for vector store.
 """
+import tempfile
 import unittest
 import numpy as np
-from src.vector_store import VectorStore
+from src.vector_store import VectorStore, faiss
 
 
 class TestVectorStore(unittest.TestCase):
     """Test cases for VectorStore class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Generate one read-only pool of embeddings shared by all tests."""
+        rng = np.random.default_rng(0)
+        cls.embeddings = rng.random((600, 128), dtype=np.float32)
+        cls.embeddings.setflags(write=False)
+
     def setUp(self):
         """Set up test fixtures."""
         self.store = VectorStore(dimension=128)
@@ -20,7 +28,7 @@ class TestVectorStore(unittest.TestCase):
 
     def test_add_document(self):
         """Test adding a document."""
-        embedding = np.random.rand(128)
+        embedding = self.embeddings[0]
         self.store.add_document(
             doc_id="test_1",
             content="Test content",
@@ -29,9 +37,23 @@ class TestVectorStore(unittest.TestCase):
         )
         self.assertEqual(self.store.size(), 1)
 
+    def test_add_documents(self):
+        """Test adding a batch of documents."""
+        embeddings = self.embeddings[:3]
+        self.store.add_documents(
+            doc_ids=["doc_0", "doc_1", "doc_2"],
+            contents=["Content 0", "Content 1", "Content 2"],
+            embeddings=embeddings,
+            metadatas=[{"page": 0}, {"page": 1}, {"page": 2}]
+        )
+
+        self.assertEqual(self.store.size(), 3)
+        self.assertEqual(self.store.get_by_id("doc_2").metadata, {"page": 2})
+        self.assertEqual(self.store.search(embeddings[1], top_k=1)[0][0].id, "doc_1")
+
     def test_add_document_wrong_dimension(self):
         """Test adding document with wrong embedding dimension."""
-        embedding = np.random.rand(64)  # Wrong dimension
+        embedding = self.embeddings[0, :64]  # Wrong dimension
         with self.assertRaises(ValueError):
             self.store.add_document(
                 doc_id="test_1",
@@ -43,7 +65,7 @@ class TestVectorStore(unittest.TestCase):
         """Test vector search."""
         # Add some documents
         for i in range(5):
-            embedding = np.random.rand(128)
+            embedding = self.embeddings[i]
             self.store.add_document(
                 doc_id=f"doc_{i}",
                 content=f"Content {i}",
@@ -51,15 +73,50 @@ class TestVectorStore(unittest.TestCase):
             )
 
         # Search
-        query_embedding = np.random.rand(128)
+        query_embedding = self.embeddings[-1]
         results = self.store.search(query_embedding, top_k=3)
 
         self.assertEqual(len(results), 3)
         self.assertTrue(all(isinstance(score, (float, np.floating)) for _, score in results))
 
+    def test_search_ranking_and_threshold(self):
+        """Test that search orders by cosine similarity and applies the threshold."""
+        base = np.zeros(128, dtype=np.float32)
+        base[0] = 1.0
+        for i, weight in enumerate([0.1, 2.0, 0.5]):
+            embedding = base.copy()
+            embedding[1] = weight
+            self.store.add_document(doc_id=f"doc_{i}", content=f"Content {i}", embedding=embedding)
+
+        results = self.store.search(base * 3, top_k=3)
+        self.assertEqual([doc.id for doc, _ in results], ["doc_0", "doc_2", "doc_1"])
+        self.assertAlmostEqual(float(results[0][1]), 1 / np.sqrt(1.01), places=5)
+
+        results = self.store.search(base, top_k=3, threshold=0.8)
+        self.assertEqual([doc.id for doc, _ in results], ["doc_0", "doc_2"])
+
+    def test_batch_search_matches_search(self):
+        """Test that batch search returns the same hits as per-query search."""
+        embeddings = self.embeddings[:20]
+        self.store.add_documents(
+            doc_ids=[f"doc_{i}" for i in range(20)],
+            contents=[f"Content {i}" for i in range(20)],
+            embeddings=embeddings
+        )
+        queries = self.embeddings[-4:].copy()
+        queries[2] = 0.0
+
+        batches = self.store.batch_search(queries, top_k=3, threshold=0.5)
+        self.assertEqual(len(batches), 4)
+        self.assertEqual(batches[2], [])
+        for query, results in zip(queries, batches):
+            expected = self.store.search(query, top_k=3, threshold=0.5)
+            self.assertEqual([doc.id for doc, _ in results], [doc.id for doc, _ in expected])
+            np.testing.assert_allclose([s for _, s in results], [s for _, s in expected], rtol=1e-5)
+
     def test_get_by_id(self):
         """Test retrieving document by ID."""
-        embedding = np.random.rand(128)
+        embedding = self.embeddings[0]
         self.store.add_document(
             doc_id="test_1",
             content="Test content",
@@ -72,7 +129,7 @@ class TestVectorStore(unittest.TestCase):
 
     def test_delete(self):
         """Test deleting a document."""
-        embedding = np.random.rand(128)
+        embedding = self.embeddings[0]
         self.store.add_document(
             doc_id="test_1",
             content="Test content",
@@ -83,6 +140,181 @@ class TestVectorStore(unittest.TestCase):
         self.store.delete("test_1")
         self.assertEqual(self.store.size(), 0)
 
+    def test_delete_keeps_index_consistent(self):
+        """Test that deleting from the middle keeps lookups and search aligned."""
+        embeddings = np.eye(128)[:4]
+        for i, embedding in enumerate(embeddings):
+            self.store.add_document(doc_id=f"doc_{i}", content=f"Content {i}", embedding=embedding)
+
+        self.assertTrue(self.store.delete("doc_1"))
+        self.assertFalse(self.store.delete("doc_1"))
+        self.assertIsNone(self.store.get_by_id("doc_1"))
+        self.assertEqual(self.store.size(), 3)
+
+        for i in (0, 2, 3):
+            self.assertEqual(self.store.get_by_id(f"doc_{i}").content, f"Content {i}")
+            doc, score = self.store.search(embeddings[i], top_k=1)[0]
+            self.assertEqual(doc.id, f"doc_{i}")
+            self.assertAlmostEqual(float(score), 1.0, places=5)
+
+    def test_add_existing_id_replaces(self):
+        """Test that re-adding an ID replaces the stored document."""
+        self.store.add_document(doc_id="test_1", content="Old", embedding=np.eye(128)[0])
+        self.store.add_document(doc_id="test_1", content="New", embedding=np.eye(128)[1])
+
+        self.assertEqual(self.store.size(), 1)
+        self.assertEqual(self.store.get_by_id("test_1").content, "New")
+        doc, score = self.store.search(np.eye(128)[1], top_k=1)[0]
+        self.assertAlmostEqual(float(score), 1.0, places=5)
+
+    def test_float16_storage(self):
+        """Test that float16 storage still ranks and scores in float32."""
+        store = VectorStore(dimension=128, dtype=np.float16)
+        embeddings = self.embeddings[:10]
+        store.add_documents(
+            doc_ids=[f"doc_{i}" for i in range(10)],
+            contents=[f"Content {i}" for i in range(10)],
+            embeddings=embeddings
+        )
+
+        doc, score = store.search(embeddings[3], top_k=1)[0]
+        self.assertEqual(doc.id, "doc_3")
+        self.assertEqual(score.dtype, np.float32)
+        self.assertAlmostEqual(float(score), 1.0, places=2)
+        self.assertEqual(doc.embedding.dtype, np.float32)
+
+        with self.assertRaises(ValueError):
+            VectorStore(dimension=128, dtype=np.float64)
+
+    def test_save_and_load(self):
+        """Test that a saved store loads with the same documents and results."""
+        embeddings = self.embeddings[:10]
+        self.store.add_documents(
+            doc_ids=[f"doc_{i}" for i in range(10)],
+            contents=[f"Content {i}" for i in range(10)],
+            embeddings=embeddings,
+            metadatas=[{"page": i} for i in range(10)]
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.store.save(tmp_dir)
+            loaded = VectorStore.load(tmp_dir)
+
+            self.assertEqual(loaded.size(), 10)
+            self.assertEqual(loaded.get_by_id("doc_4").metadata, {"page": 4})
+            self.assertEqual(
+                [doc.id for doc, _ in loaded.search(embeddings[2], top_k=3)],
+                [doc.id for doc, _ in self.store.search(embeddings[2], top_k=3)]
+            )
+
+            # The memory-mapped store can still be modified
+            loaded.delete("doc_2")
+            loaded.add_document("doc_10", "Content 10", embeddings[2])
+            self.assertEqual(loaded.search(embeddings[2], top_k=1)[0][0].id, "doc_10")
+
+    def test_save_over_loaded_directory(self):
+        """Test that a memory-mapped store can be saved back to where it was loaded from."""
+        index_types = ("exact", "flat", "hnsw", "ivfpq") if faiss else ("exact",)
+        for index_type in index_types:
+            with self.subTest(index_type=index_type), tempfile.TemporaryDirectory() as tmp_dir:
+                store = VectorStore(dimension=128, index_type=index_type, nlist=4, ivf_train_size=500)
+                store.add_documents([f"doc_{i}" for i in range(600)], [""] * 600, self.embeddings)
+                store.save(tmp_dir)
+                VectorStore.load(tmp_dir).save(tmp_dir)
+
+                loaded = VectorStore.load(tmp_dir)
+                loaded.delete("doc_5")
+                loaded.save(tmp_dir)
+
+                reloaded = VectorStore.load(tmp_dir)
+                self.assertEqual(reloaded.size(), 599)
+                self.assertIsNone(reloaded.get_by_id("doc_5"))
+                self.assertEqual(reloaded.search(self.embeddings[7], top_k=1)[0][0].id, "doc_7")
+
+    @unittest.skipUnless(faiss, "faiss not installed")
+    def test_faiss_index_matches_exact_search(self):
+        """Test that FAISS-backed stores agree with exact search across updates."""
+        embeddings = self.embeddings[:50]
+        doc_ids = [f"doc_{i}" for i in range(50)]
+        stores = [VectorStore(dimension=128, index_type=t) for t in ("exact", "flat", "hnsw")]
+        for store in stores:
+            store.add_documents(doc_ids[:40], [""] * 40, embeddings[:40])
+            for i in range(40, 50):
+                store.add_document(doc_ids[i], "", embeddings[i])
+            store.delete("doc_3")
+            store.add_document("doc_7", "", embeddings[3])
+
+        query = embeddings[3]
+        exact, flat, hnsw = ([doc.id for doc, _ in store.search(query, top_k=5)] for store in stores)
+        self.assertEqual(flat, exact)
+        self.assertEqual(hnsw[0], "doc_7")
+        self.assertNotIn("doc_3", flat + hnsw)
+
+        with self.assertRaises(ValueError):
+            VectorStore(dimension=128, index_type="unknown")
+
+    @unittest.skipUnless(faiss, "faiss not installed")
+    def test_faiss_updates_without_rebuild(self):
+        """Test that deletes and replacements update a FAISS index in place."""
+        for index_type, ntotal in (("flat", 48), ("hnsw", 51)):
+            with self.subTest(index_type=index_type):
+                store = VectorStore(dimension=128, index_type=index_type)
+                store.add_documents([f"doc_{i}" for i in range(50)], [""] * 50, self.embeddings[:50])
+                store.delete("doc_3")
+                store.delete("doc_10")
+                store.add_document("doc_7", "", self.embeddings[3])
+
+                self.assertFalse(store._index_stale)
+                self.assertEqual(store._index.ntotal, ntotal)
+                self.assertEqual(store.search(self.embeddings[3], top_k=1)[0][0].id, "doc_7")
+                hits = [doc.id for doc, _ in store.search(self.embeddings[10], top_k=48)]
+                self.assertEqual(len(hits), 48)
+                self.assertNotIn("doc_10", hits)
+
+        # HNSW cannot remove vectors, so it is rebuilt once a quarter are deleted
+        store = VectorStore(dimension=128, index_type="hnsw")
+        store.add_documents([f"doc_{i}" for i in range(40)], [""] * 40, self.embeddings[:40])
+        for i in range(11):
+            store.delete(f"doc_{i}")
+        self.assertTrue(store._index_stale)
+        self.assertEqual(store.search(self.embeddings[20], top_k=1)[0][0].id, "doc_20")
+        self.assertEqual(store._index.ntotal, 29)
+
+    @unittest.skipUnless(faiss, "faiss not installed")
+    def test_faiss_batch_search(self):
+        """Test batched search through a FAISS index."""
+        store = VectorStore(dimension=128, index_type="flat")
+        embeddings = self.embeddings[:20]
+        store.add_documents([f"doc_{i}" for i in range(20)], [""] * 20, embeddings)
+
+        queries = np.vstack([embeddings[[4, 9]], np.zeros((1, 128))])
+        batches = store.batch_search(queries, top_k=3)
+        self.assertEqual([results[0][0].id for results in batches[:2]], ["doc_4", "doc_9"])
+        self.assertEqual(batches[2], [])
+        for query, results in zip(queries, batches):
+            self.assertEqual(
+                [doc.id for doc, _ in results],
+                [doc.id for doc, _ in store.search(query, top_k=3)]
+            )
+
+    @unittest.skipUnless(faiss, "faiss not installed")
+    def test_ivfpq_trains_once_enough_documents(self):
+        """Test that an IVF-PQ store searches exactly until it can be trained."""
+        embeddings = self.embeddings
+        store = VectorStore(dimension=128, index_type="ivfpq", nlist=4, pq_m=8, ivf_train_size=500)
+
+        store.add_documents([f"doc_{i}" for i in range(400)], [""] * 400, embeddings[:400])
+        self.assertFalse(store._index.is_trained)
+        self.assertEqual(store.search(embeddings[7], top_k=1)[0][0].id, "doc_7")
+
+        store.add_documents([f"doc_{i}" for i in range(400, 600)], [""] * 200, embeddings[400:])
+        self.assertTrue(store._index.is_trained)
+        self.assertEqual(store._index.ntotal, 600)
+        self.assertEqual(len(store.search(embeddings[7], top_k=5)), 5)
+
+        with self.assertRaises(ValueError):
+            VectorStore(dimension=100, index_type="ivfpq", pq_m=8)
+
 
 if __name__ == '__main__':
     unittest.main()
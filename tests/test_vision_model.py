@@ -0,0 +1,132 @@
+"""
+Unit tests for the vision model wrapper.
+"""
+import base64
+import json
+import tempfile
+import unittest
+from io import BytesIO
+from unittest import mock
+from PIL import Image
+from src.cache import CacheManager
+from src.vision_model import DIAGRAM_PROMPT, MAX_IMAGE_SIDE, VisionModel, _data_url
+
+
+def _encode_png(size):
+    """Encode a blank PNG of the given size as base64."""
+    buffered = BytesIO()
+    Image.new("RGB", size).save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
+class TestImageUrl(unittest.TestCase):
+    """Test cases for building image data URLs."""
+
+    def test_small_image_sent_unchanged(self):
+        """Test that images within the size limit are not re-encoded."""
+        image = _encode_png((300, 200))
+        self.assertEqual(_data_url(image), f"data:image/jpeg;base64,{image}")
+        self.assertEqual(_data_url(f"data:image/png;base64,{image}"), f"data:image/png;base64,{image}")
+
+    def test_large_image_downscaled(self):
+        """Test that oversized images are shrunk and re-encoded as JPEG."""
+        url = _data_url(_encode_png((4000, 1000)))
+
+        self.assertTrue(url.startswith("data:image/jpeg;base64,"))
+        image = Image.open(BytesIO(base64.b64decode(url.partition(",")[2])))
+        self.assertEqual(image.format, "JPEG")
+        self.assertEqual(image.size, (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE // 4))
+
+    def test_unreadable_images_sent_unchanged(self):
+        """Test that payloads Pillow cannot or will not decode pass through."""
+        self.assertEqual(_data_url("not an image"), "data:image/jpeg;base64,not an image")
+
+        image = _encode_png((3000, 100))
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            self.assertEqual(_data_url(image), f"data:image/jpeg;base64,{image}")
+
+
+class TestAnalyzeDiagramsBatch(unittest.TestCase):
+    """Test cases for batch diagram analysis."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(cache_dir=self.tmp_dir.name)
+        self.model = VisionModel(model_name="test-model", api_key="test-key", cache=self.cache)
+        self.model.client = mock.Mock()
+        self.images = [_encode_png((10 + i, 10)) for i in range(3)]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def _output_line(self, custom_id, status_code, content=None):
+        """Build one line of a batch output file."""
+        body = {"choices": [{"message": {"content": content}}]} if status_code == 200 else {}
+        return json.dumps({
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body}
+        })
+
+    def test_results_mapped_by_custom_id(self):
+        """Test that only uncached images are submitted and results land in input order."""
+        self.cache.cache_vision_result(self.images[1], DIAGRAM_PROMPT, "test-model", "cached", 800)
+        client = self.model.client
+        client.batches.create.return_value = mock.Mock(id="batch_1", status="in_progress")
+        client.batches.retrieve.return_value = mock.Mock(
+            id="batch_1", status="completed", output_file_id="file_out"
+        )
+        # Output lines need not follow input order
+        client.files.content.return_value.text = "\n".join([
+            self._output_line("2", 500),
+            self._output_line("0", 200, "first"),
+        ])
+
+        results = self.model.analyze_diagrams_batch(self.images, poll_interval=0)
+
+        self.assertEqual([r['analysis'] for r in results], ["first", "cached", None])
+        self.assertTrue(all(r['type'] == 'diagram_analysis' for r in results))
+        client.batches.retrieve.assert_called_once_with("batch_1")
+        client.files.content.assert_called_once_with("file_out")
+
+        name, data = client.files.create.call_args.kwargs['file']
+        self.assertEqual(name, "diagrams.jsonl")
+        requests = [json.loads(line) for line in data.decode().splitlines()]
+        self.assertEqual([r['custom_id'] for r in requests], ["0", "2"])
+        self.assertEqual(requests[0]['url'], "/v1/chat/completions")
+        self.assertEqual(requests[0]['body']['model'], "test-model")
+        self.assertEqual(requests[0]['body']['max_tokens'], 800)
+
+        # Successes are cached, failures are not
+        self.assertEqual(
+            self.cache.get_cached_vision_result(self.images[0], DIAGRAM_PROMPT, "test-model", 800), "first"
+        )
+        self.assertIsNone(
+            self.cache.get_cached_vision_result(self.images[2], DIAGRAM_PROMPT, "test-model", 800)
+        )
+
+    def test_all_cached_skips_batch(self):
+        """Test that no batch is created when every image is cached."""
+        for image in self.images:
+            self.cache.cache_vision_result(image, DIAGRAM_PROMPT, "test-model", "cached", 800)
+
+        results = self.model.analyze_diagrams_batch(self.images)
+
+        self.assertEqual([r['analysis'] for r in results], ["cached"] * 3)
+        self.model.client.files.create.assert_not_called()
+        self.model.client.batches.create.assert_not_called()
+
+    def test_batch_without_output_raises(self):
+        """Test that a batch ending without an output file raises."""
+        self.model.client.batches.create.return_value = mock.Mock(
+            id="batch_1", status="failed", output_file_id=None
+        )
+
+        with self.assertRaises(RuntimeError):
+            self.model.analyze_diagrams_batch(self.images)
+
+
+if __name__ == '__main__':
+    unittest.main()